@@ -1,16 +1,39 @@
 import streamlit as st
-import requests
 import os
+import queue
+import time
+import html
+from concurrent.futures import as_completed
 from dotenv import load_dotenv
 from datetime import datetime
-from auth_component import show_login_form, authenticate_user, show_user_profile, require_auth
-from ui_components import apply_futuristic_theme, create_cyberpunk_header, create_news_card, create_loading_animation, create_footer
+from auth_component import show_login_form, authenticate_user, show_user_profile, require_auth, sync_session_tokens
+from ui_components import apply_futuristic_theme, create_cyberpunk_header, create_news_card, create_loading_animation, create_footer, render_card_html, render_feed_html, FeedRenderer, article_click_listener
+from firebase_config import initialize_firebase, get_user_data, save_user_data
+from news_client import fetch_top_headlines
+from swr_cache import StaleWhileRevalidateCache, DEFAULT_SOFT_TTL, DEFAULT_HARD_TTL
+from shared_cache import SharedCache
+from models import Article
+from dedup import dedupe_articles
+from digest_store import read_digest, DEFAULT_DIGEST_PATH, DEFAULT_MAX_AGE
+from summary_cache import SummaryCache, DEFAULT_TTL, DEFAULT_MAX_ENTRIES
+import http_client
+from summarizer import OPENROUTER_URL, SummarizationEngine, DEFAULT_MAX_WORKERS, DEFAULT_RATE, DEFAULT_BURST, DEFAULT_BATCH_SIZE
+from summary_scheduler import budget_from_env
+from image_cache import ImageCache, DEFAULT_IMAGE_DIR, DEFAULT_MAX_BYTES, DEFAULT_CONCURRENCY
+import article_archive
+from search_index import SearchIndex, DEFAULT_INDEX_PATH
+from personalization import InterestProfile, rank
+from read_state import SeenFilter, partition_seen
 
 # Load environment variables
 load_dotenv()
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+STREAM_SUMMARIES = os.getenv("SUMMARY_STREAM_TOKENS", "false").lower() in ("1", "true", "yes")
+FEED_PAGE_SIZE = int(os.getenv("FEED_PAGE_SIZE", 15))
+NEWS_PAGE_SIZE = 100  # Largest page NewsAPI returns
+SEARCH_RESULTS = 20
 
 # Streamlit Page Config
 st.set_page_config(
@@ -23,6 +46,11 @@ st.set_page_config(
 # Apply futuristic theme
 apply_futuristic_theme()
 
+# Firebase Admin verifies ID tokens and backs the user documents; without it those steps are skipped
+@st.cache_resource
+def firebase_ready():
+    return initialize_firebase(show_errors=False)
+
 # Authentication Check
 if 'user' not in st.session_state:
     # Show login form
@@ -42,120 +70,236 @@ if 'user' not in st.session_state:
     st.stop()
 
 # User is authenticated - show main app
+sync_session_tokens()
+# Re-verify the ID token on every rerun; the verified-token and certificate caches keep this off the network
+if firebase_ready() and not require_auth():
+    st.stop()
 show_user_profile(st.session_state['user'])
 create_cyberpunk_header()
 
+# Stale-while-revalidate feed cache shared by every worker process, so only one of them calls NewsAPI
+@st.cache_resource
+def get_feed_cache():
+    return StaleWhileRevalidateCache(
+        soft_ttl=int(os.getenv("FEED_SOFT_TTL", DEFAULT_SOFT_TTL)),
+        hard_ttl=int(os.getenv("FEED_HARD_TTL", DEFAULT_HARD_TTL)),
+        store=SharedCache(namespace="feed"),
+    )
+
+# Local thumbnail cache for article images, shared with the ingestion worker
+@st.cache_resource
+def get_image_cache():
+    return ImageCache(
+        directory=os.getenv("IMAGE_CACHE_DIR", DEFAULT_IMAGE_DIR),
+        max_bytes=int(os.getenv("IMAGE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        concurrency=int(os.getenv("IMAGE_FETCH_CONCURRENCY", DEFAULT_CONCURRENCY)),
+    )
+
+# Append-only history of every article seen, shared with the ingestion worker
+@st.cache_resource
+def get_article_archive():
+    return article_archive.ArticleArchive(
+        directory=os.getenv("ARCHIVE_DIR", article_archive.DEFAULT_ARCHIVE_DIR),
+        segment_bytes=int(os.getenv("ARCHIVE_SEGMENT_BYTES", article_archive.DEFAULT_SEGMENT_BYTES)),
+        max_age=int(os.getenv("ARCHIVE_MAX_AGE_DAYS", article_archive.DEFAULT_MAX_AGE // 86400)) * 86400,
+        max_bytes=int(os.getenv("ARCHIVE_MAX_BYTES", article_archive.DEFAULT_MAX_BYTES)),
+    )
+
+# Full-text index over every archived article, kept up to date by whichever process fetches news
+@st.cache_resource
+def get_search_index():
+    return SearchIndex(os.getenv("SEARCH_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+def load_headlines():
+    articles, error = fetch_top_headlines(NEWS_API_KEY, page_size=NEWS_PAGE_SIZE)
+    if error:
+        raise RuntimeError(error)
+    # One card and one summary per story, however many outlets carry it
+    articles = dedupe_articles([Article.from_newsapi(article) for article in articles])
+    # Start fetching first-page thumbnails without waiting on publishers' hosts; cards show a
+    # placeholder until they land. Later pages' images are fetched when their page comes up next.
+    get_image_cache().warm(article.image_url for article in articles[:FEED_PAGE_SIZE])
+    get_article_archive().append(articles)
+    get_search_index().update(articles)
+    return articles
+
+def archive_summaries(articles):
+    """Archive and index articles again once they have AI summaries; copies already stored are skipped"""
+    summarized = [article for article in articles if article.summary]
+    if summarized:
+        get_article_archive().append(summarized)
+        get_search_index().update(summarized)
+
 # Function to fetch news
-@st.cache_data(ttl=86400)  # Cache data for 24 hours
 def fetch_news():
-    if not NEWS_API_KEY:
-        st.error("⚠️ NEWS_API_KEY not found. Please add it to your .env file.")
-        return []
-    
-    url = f"https://newsapi.org/v2/top-headlines?category=technology&language=en&apiKey={NEWS_API_KEY}"
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("status") == "ok":
-                return data.get("articles", [])
-            else:
-                st.error(f"NewsAPI error: {data.get('message', 'Unknown error')}")
-                return []
-        elif response.status_code == 401:
-            st.error("❌ Invalid NewsAPI key. Please check your API key.")
-            return []
-        elif response.status_code == 429:
-            st.error("⏰ API rate limit exceeded. Please try again later.")
-            return []
-        else:
-            st.error(f"Failed to fetch news. Status code: {response.status_code}")
-            return []
-    except requests.exceptions.Timeout:
-        st.error("⏱️ Request timed out. Please check your internet connection.")
-        return []
-    except requests.exceptions.ConnectionError:
-        st.error("🌐 Connection error. Please check your internet connection.")
-        return []
+        return get_feed_cache().get("top-headlines", load_headlines)
     except Exception as e:
-        st.error(f"❌ Unexpected error: {str(e)}")
+        st.error(str(e))
         return []
 
-# Function to summarize news using OpenRouter
-def summarize_with_openrouter(title, description, debug_mode=False):
-    if not description:
-        return "No description available."
+# Precomputed digest written by ingest_worker.py, re-read at most once a minute
+@st.cache_data(ttl=60)
+def load_digest():
+    return read_digest(
+        os.getenv("DIGEST_PATH", DEFAULT_DIGEST_PATH),
+        max_age=int(os.getenv("DIGEST_MAX_AGE", DEFAULT_MAX_AGE)),
+    )
 
-    if not OPENROUTER_API_KEY:
-        return description  # fallback if API key missing
-    
-    # Debug mode - show API key status
-    if debug_mode:
-        st.sidebar.write(f"OpenRouter API Key: {'✅ Set' if OPENROUTER_API_KEY else '❌ Missing'}")
-        st.sidebar.write(f"Title length: {len(title)}")
-        st.sidebar.write(f"Description length: {len(description)}")
-
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": "openai/gpt-4o-mini",
-        "messages": [
-            {"role": "system", "content": "You are an expert AI news summarizer. Summarize briefly in 2-3 sentences."},
-            {"role": "user", "content": f"Title: {title}\n\nDescription: {description}\n\nSummarize this for a tech news digest."}
-        ],
-        "max_tokens": 150,
-        "temperature": 0.7
-    }
+# Persistent summary cache shared by every worker process and the ingestion worker
+@st.cache_resource
+def get_summary_cache():
+    return SummaryCache(
+        ttl=int(os.getenv("SUMMARY_CACHE_TTL", DEFAULT_TTL)),
+        max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    )
 
-    try:
-        response = requests.post("https://openrouter.ai/api/v1/chat/completions", json=payload, headers=headers, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            if "choices" in data and len(data["choices"]) > 0:
-                return data["choices"][0]["message"]["content"].strip()
-            else:
-                return description
-        elif response.status_code == 401:
-            st.warning("⚠️ Invalid OpenRouter API key. Using original description.")
-            return description
-        elif response.status_code == 429:
-            st.warning("⏰ OpenRouter rate limit exceeded. Using original description.")
-            return description
-        elif response.status_code == 400:
-            try:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", "Bad request")
-                st.warning(f"OpenRouter API error: {error_msg}. Using original description.")
-            except:
-                st.warning("OpenRouter API error (400): Bad request. Using original description.")
-            return description
-        else:
-            try:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", f"Status {response.status_code}")
-                st.warning(f"OpenRouter API error: {error_msg}. Using original description.")
-            except:
-                st.warning(f"OpenRouter API error (status {response.status_code}). Using original description.")
-            return description
-    except requests.exceptions.Timeout:
-        st.warning("⏱️ OpenRouter request timed out. Using original description.")
-        return description
-    except requests.exceptions.ConnectionError:
-        st.warning("🌐 OpenRouter connection error. Using original description.")
-        return description
-    except Exception as e:
-        st.warning(f"OpenRouter summarization failed: {e}. Using original description.")
-        return description
+# Concurrent summarization engine shared by every session in this process
+@st.cache_resource
+def get_summarization_engine():
+    return SummarizationEngine(
+        OPENROUTER_API_KEY,
+        cache=get_summary_cache(),
+        # Sized to the page, so every card's summary starts at once
+        max_workers=int(os.getenv("SUMMARY_MAX_WORKERS", max(DEFAULT_MAX_WORKERS, FEED_PAGE_SIZE))),
+        rate=float(os.getenv("OPENROUTER_RATE_LIMIT", DEFAULT_RATE)),
+        burst=int(os.getenv("OPENROUTER_BURST", max(DEFAULT_BURST, FEED_PAGE_SIZE))),
+        batch_size=int(os.getenv("SUMMARY_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        budget=budget_from_env(),
+    )
+
+def render_stats_caption(stats):
+    if not stats:
+        return ""
+    caption = f"Feed: {stats['elements']} elements · {stats['bytes'] / 1024:.1f} KB · {stats['ms']:.0f} ms"
+    hit_rate = stats.get("images", {}).get("hit_rate")
+    if hit_rate is not None:
+        caption += f" · images {hit_rate:.0%} cached"
+    summaries = stats.get("summaries")
+    if summaries:
+        caption += (f" · summary queue {summaries['queue']['depth']}"
+                    f" · wait {summaries['queue']['wait']['visible']['p95_ms']:.0f} ms p95"
+                    f" · ${summaries['budget']['day_cost']:.4f} today")
+    return caption
+
+def search_articles(query):
+    """Archived articles matching query, best first, with the time the lookup took"""
+    started = time.perf_counter()
+    index = get_search_index()
+    # Pick up articles the ingestion worker indexed since this process loaded the index
+    index.refresh()
+    hits = index.search(query, limit=SEARCH_RESULTS)
+    results = get_article_archive().get(article_id for article_id, _ in hits)
+    return results, (time.perf_counter() - started) * 1000
+
+def render_search_results(query):
+    """Matching articles as one feed element; summaries come from the archive or the local summarizer"""
+    results, elapsed = search_articles(query)
+    st.markdown(f'<p class="feed-page-label">{len(results)} RESULTS FOR "{html.escape(query)}" · {elapsed:.0f} MS</p>',
+                unsafe_allow_html=True)
+    if not results:
+        return
+    engine = get_summarization_engine()
+    image_cache = get_image_cache()
+    results = [
+        article if article.summary
+        else article.with_summary(engine.cached_summary(article.title, article.description)
+                                  or engine.quick_summary(article.title, article.description))
+        for article in results
+    ]
+    st.markdown(render_feed_html(results, image_srcs=[image_cache.thumbnail_url(a.image_url) for a in results]),
+                unsafe_allow_html=True)
+
+def user_doc_uid():
+    """uid whose Firestore document can be read and written, or None when Firebase is not configured"""
+    return st.session_state['user'].get('uid') if firebase_ready() else None
+
+def get_user_doc():
+    """The signed-in user's Firestore document, read once per session"""
+    if 'user_doc' not in st.session_state:
+        uid = user_doc_uid()
+        st.session_state['user_doc'] = (get_user_data(uid) if uid else None) or {}
+    return st.session_state['user_doc']
+
+def get_interest_profiles():
+    """(live, ranking) interest profiles of the signed-in user, loaded once per session.
+
+    Clicks train the live profile. The feed is ordered by the profile as it
+    was when the session started, so it does not reshuffle under the reader.
+    """
+    if 'interest_profile' not in st.session_state:
+        profile = InterestProfile.from_doc(get_user_doc().get('interests'))
+        st.session_state['interest_profile'] = profile
+        st.session_state['ranking_profile'] = profile.copy()
+    return st.session_state['interest_profile'], st.session_state['ranking_profile']
+
+def get_seen_filters():
+    """(live, ranking) filters of articles the user has seen, loaded once per session.
+
+    Cards shown in this session go into the live filter; the feed is ordered
+    by what had been seen when the session started, so cards do not move while being read.
+    """
+    if 'seen_filter' not in st.session_state:
+        seen = SeenFilter.from_doc(get_user_doc().get('seen'))
+        st.session_state['seen_filter'] = seen
+        st.session_state['ranking_seen_filter'] = seen.copy()
+    return st.session_state['seen_filter'], st.session_state['ranking_seen_filter']
+
+def mark_seen(articles):
+    """Record articles as seen, saving the filter only when it changed"""
+    uid = user_doc_uid()
+    seen, _ = get_seen_filters()
+    if seen.add(article.id for article in articles) and uid:
+        save_user_data(uid, {'seen': seen.to_doc()})
+
+def record_article_click(article_id, articles):
+    """Learn from an opened article and save the updated interests to the user's document"""
+    article = next((a for a in articles if a.id == article_id), None)
+    if article is None:
+        # Opened from search results, which can reach past the current feed
+        found = get_article_archive().get([article_id])
+        article = found[0] if found else None
+    uid = user_doc_uid()
+    if article is None or not uid:
+        return
+    profile, _ = get_interest_profiles()
+    profile.learn(article)
+    save_user_data(uid, {'interests': profile.to_doc()})
+    mark_seen([article])
+
+def set_feed_page(page):
+    st.session_state['feed_page'] = page
+
+def render_pagination(page, page_count):
+    """Previous / next buttons below the feed"""
+    previous_col, label_col, next_col = st.columns([1, 2, 1])
+    previous_col.button("⬅ NEWER", on_click=set_feed_page, args=(page - 1,), disabled=page == 0,
+                        use_container_width=True)
+    label_col.markdown(f'<p class="feed-page-label">PAGE {page + 1} / {page_count}</p>', unsafe_allow_html=True)
+    next_col.button("OLDER ➡", on_click=set_feed_page, args=(page + 1,), disabled=page >= page_count - 1,
+                    use_container_width=True)
 
 # Remove debug mode
 
-# Fetch and display news
-articles = fetch_news()
+# Fetch and display news, preferring the digest precomputed by the ingestion worker
+digest = load_digest()
+articles = digest["articles"] if digest else fetch_news()
+
+# Clicks on "ACCESS FULL ARTICLE" train this user's interests
+click = article_click_listener()
+if click and click.get('at') != st.session_state.get('last_article_click'):
+    st.session_state['last_article_click'] = click['at']
+    record_article_click(click.get('id'), articles)
+# Articles matching the user's interests come first, so they are also summarized first.
+# Articles seen in earlier visits go after unseen ones, so they are not re-rendered and re-summarized up top.
+articles = partition_seen(rank(articles or [], get_interest_profiles()[1]), get_seen_filters()[1])
 
-if articles:
+search_query = st.text_input("🔎 SEARCH THE ARCHIVE", key="search_query",
+                             placeholder="Search titles, sources and summaries").strip()
+
+if search_query:
+    render_search_results(search_query)
+elif articles:
     st.markdown("""
     <div style="text-align: center; margin: 2rem 0;">
         <h2 style="color: #8b5cf6; font-family: 'Orbitron', monospace;">
@@ -167,76 +311,87 @@ if articles:
     
     st.markdown("---")
     
-    for i, article in enumerate(articles[:15], 1):
-        # Create elegant news card
-        st.markdown(f"""
-        <div class="news-card">
-            <div style="display: flex; align-items: center; margin-bottom: 1rem;">
-                <span style="background: linear-gradient(45deg, #8b5cf6, #a855f7); 
-                            color: #ffffff; padding: 0.3rem 0.8rem; border-radius: 20px; 
-                            font-weight: 700; font-family: 'Orbitron', monospace; 
-                            font-size: 0.9rem; margin-right: 1rem;">
-                    #{i}
-                </span>
-                <h3 style="margin: 0; color: #8b5cf6; font-family: 'Orbitron', monospace;">
-                    {article.get('title', 'No Title')}
-                </h3>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Display image if available
-        if article.get("urlToImage"):
-            try:
-                st.image(article["urlToImage"], width="stretch", caption="📸 Article Image")
-            except Exception:
-                st.info("🖼️ Image could not be loaded")
-        
-        # Show publication info
-        if article.get("publishedAt"):
-            pub_date = datetime.fromisoformat(article["publishedAt"].replace('Z', '+00:00'))
-            st.markdown(f"""
-            <div style="background: rgba(248, 244, 255, 0.5); padding: 0.5rem 1rem; 
-                        border-radius: 8px; border-left: 3px solid #8b5cf6; margin: 1rem 0;">
-                <p style="color: #6b7280; margin: 0; font-size: 0.9rem;">
-                    📅 Published: {pub_date.strftime('%Y-%m-%d %H:%M')} | 
-                    📡 Source: {article.get('source', {}).get('name', 'Unknown')}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # Summarize with loading indicator
-        with st.spinner("🤖 AI is analyzing article data..."):
-            summary = summarize_with_openrouter(article["title"], article.get("description", ""), False)
-        
-        # Display summary in elegant style
-        st.markdown(f"""
-        <div style="background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(168, 85, 247, 0.1));
-                    border: 1px solid #8b5cf6; border-radius: 10px; padding: 1rem; margin: 1rem 0;">
-            <h4 style="color: #8b5cf6; margin: 0 0 0.5rem 0; font-family: 'Orbitron', monospace;">
-                🤖 AI ANALYSIS
-            </h4>
-            <p style="color: #4a4a4a; margin: 0; line-height: 1.6;">
-                {summary}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Link to full article
-        if article.get("url"):
-            st.markdown(f"""
-            <div style="text-align: center; margin: 1rem 0;">
-                <a href="{article['url']}" target="_blank" 
-                   style="display: inline-block; background: linear-gradient(45deg, #ec4899, #f472b6);
-                          color: #ffffff; padding: 0.5rem 1.5rem; border-radius: 25px; 
-                          text-decoration: none; font-weight: 600; font-family: 'Orbitron', monospace;
-                          transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(236, 72, 153, 0.3);">
-                    🔗 ACCESS FULL ARTICLE
-                </a>
-            </div>
-            """, unsafe_allow_html=True)
+    engine = get_summarization_engine()
+    image_cache = get_image_cache()
+    renderer = FeedRenderer()
+    
+    # Only the current page is rendered and summarized, so each interaction costs the same however long the feed is
+    page_count = max(1, -(-len(articles) // FEED_PAGE_SIZE))
+    page = min(st.session_state.get('feed_page', 0), page_count - 1)
+    first = page * FEED_PAGE_SIZE
+    next_page_articles = articles[first + FEED_PAGE_SIZE:first + 2 * FEED_PAGE_SIZE]
+    
+    # Summaries already in the cache are applied up front, so a warm feed renders in one element
+    visible_articles = [
+        article if article.summary else article.with_summary(engine.cached_summary(article.title, article.description))
+        for article in articles[first:first + FEED_PAGE_SIZE]
+    ]
+    pending = [n for n, article in enumerate(visible_articles) if not article.summary]
+    # Cards with the AI summaries that arrive below, archived once the page is done
+    summarized = list(visible_articles)
+    # Local thumbnails; images still missing show a placeholder and are fetched for the next rerun
+    image_srcs = [image_cache.thumbnail_url(article.image_url) for article in visible_articles]
+    
+    if not pending:
+        renderer.emit(render_feed_html(visible_articles, start=first + 1, image_srcs=image_srcs))
+        # Warm the next page while the reader is on this one
+        engine.prefetch(next_page_articles)
+        image_cache.warm(article.image_url for article in next_page_articles)
+    else:
+        # One element per card; pending cards are re-rendered as their summaries complete
+        slots = []
+        for n, article in enumerate(visible_articles):
+            slot = st.empty()
+            # Pending cards start with an instant local summary that the AI one replaces
+            quick = None if article.summary else engine.quick_summary(article.title, article.description)
+            renderer.emit(render_card_html(article, first + n + 1, summary=quick, pending=not article.summary,
+                                           image_src=image_srcs[n]), slot)
+            slots.append(slot)
         
-        st.markdown("---")
+        # Fill summaries in completion order. The pool and burst cover a whole page, so
+        # every request starts at once and the page waits about as long as the slowest one.
+        # The next page is queued behind this one so it never delays it.
+        if STREAM_SUMMARIES:
+            updates = queue.Queue()
+            for n in pending:
+                article = visible_articles[n]
+                engine.submit_stream(n, article.title, article.description, updates)
+            engine.prefetch(next_page_articles)
+            image_cache.warm(article.image_url for article in next_page_articles)
+            remaining = len(pending)
+            while remaining:
+                n, result = updates.get()
+                if result is None:
+                    remaining -= 1
+                    continue
+                if result.ok:
+                    summarized[n] = visible_articles[n].with_summary(result.summary)
+                # Partial snapshots bypass the card cache; only the final text is worth keeping
+                render = render_card_html if result.ok or result.warning else render_card_html.__wrapped__
+                renderer.emit(render(visible_articles[n], first + n + 1, summary=result.summary, warning=result.warning,
+                                     image_src=image_srcs[n]), slots[n])
+        else:
+            futures = engine.submit_many([visible_articles[n] for n in pending])
+            engine.prefetch(next_page_articles)
+            image_cache.warm(article.image_url for article in next_page_articles)
+            index_for_future = dict(zip(futures, pending))
+            for future in as_completed(futures):
+                result = future.result()
+                n = index_for_future[future]
+                if result.ok:
+                    summarized[n] = visible_articles[n].with_summary(result.summary)
+                renderer.emit(render_card_html(visible_articles[n], first + n + 1, summary=result.summary, warning=result.warning,
+                                               image_src=image_srcs[n]), slots[n])
+    
+    archive_summaries(summarized)
+    mark_seen(visible_articles)
+    st.session_state['render_stats'] = dict(renderer.stats(), images=image_cache.stats(), summaries=engine.stats())
+    if http_client.circuit_open(OPENROUTER_URL):
+        st.info("🔌 OpenRouter is unavailable, so AI summaries are paused. Showing quick local summaries.")
+    elif engine.budget.exhausted():
+        st.info("💸 AI summary budget reached. Showing quick local summaries until it resets.")
+    if page_count > 1:
+        render_pagination(page, page_count)
 else:
     st.markdown("""
     <div style="text-align: center; padding: 3rem; background: linear-gradient(135deg, 
@@ -258,5 +413,8 @@ st.markdown(f"""
     <p style="color: #6b7280; margin: 0; font-size: 0.9rem;">
         Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     </p>
+    <p style="color: #9ca3af; margin: 0.3rem 0 0 0; font-size: 0.75rem;">
+        {render_stats_caption(st.session_state.get('render_stats'))}
+    </p>
 </div>
 """, unsafe_allow_html=True)
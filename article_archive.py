@@ -0,0 +1,440 @@
+"""
+Append-Only Article Archive for Tech News App
+
+Articles are appended as JSON lines to segment files. Each segment has a
+fixed-width index of (published time, offset, length, source hash, id)
+records. Once a segment is full it is sealed: its index is sorted by time,
+so range queries memory-map it and binary-search instead of reading
+articles. A JSON manifest lists the live segments oldest first. It is
+replaced atomically, so readers in other processes always see a
+consistent set.
+
+Compaction merges sealed segments into one: it keeps only the newest
+version of each article and drops articles past the age or size retention.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timezone
+
+import numpy as np
+
+from models import Article
+
+DEFAULT_ARCHIVE_DIR = os.path.join(".cache", "archive")
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_AGE = 90 * 24 * 3600  # Seconds an article is kept
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_COMPACT_INTERVAL = 6 * 3600
+RECENT_IDS = 50000  # Articles remembered to skip re-appending unchanged copies
+
+INDEX_DTYPE = np.dtype([("ts", "<i8"), ("offset", "<u8"), ("length", "<u4"), ("source", "<u4"), ("id", "<u8")])
+MANIFEST = "manifest.json"
+LOCK_FILE = "archive.lock"
+
+
+def source_hash(source):
+    """32-bit hash of a source name, stored in the index to filter without reading articles"""
+    return zlib.crc32((source or "").strip().lower().encode("utf-8"))
+
+
+def _timestamp(value):
+    """Seconds since the epoch for a datetime (naive means UTC) or a number; None passes through"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _fingerprint(article):
+    return (article.summary, article.also_reported_by)
+
+
+class ArticleArchive:
+    """Segment files plus a manifest in one directory; safe for several processes on a host.
+
+    Writers (append, compact) serialize on a file lock. Readers never
+    lock: they read the manifest, then memory-map the indexes it lists.
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR, segment_bytes=DEFAULT_SEGMENT_BYTES,
+                 max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()
+        self._compactor = None
+        self._stopped = threading.Event()
+
+    # Files and manifest
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _segment_name(segment_id):
+        return f"segment-{segment_id:08d}.jsonl"
+
+    @staticmethod
+    def _index_name(segment_id, sealed):
+        return f"segment-{segment_id:08d}.{'idx' if sealed else 'log'}"
+
+    def _read_manifest(self):
+        try:
+            with open(self._path(MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"next_id": 1, "segments": []}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self._path(f"{MANIFEST}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._path(MANIFEST))
+
+    @contextmanager
+    def _writer(self):
+        """Exclusive write access across threads and processes"""
+        with self._lock, open(self._path(LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self, segment):
+        """Index records of a segment: memory-mapped when sealed, the append log otherwise"""
+        path = self._path(self._index_name(segment["id"], segment["sealed"]))
+        count = os.path.getsize(path) // INDEX_DTYPE.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=INDEX_DTYPE)
+        # A writer may be mid-record on the log; only whole records are mapped
+        return np.memmap(path, dtype=INDEX_DTYPE, mode="r", shape=(count,))
+
+    # Writing
+
+    def append(self, articles):
+        """Append new articles and new versions of known ones. Returns the number written.
+
+        A copy without a summary keeps the summary of the stored version, so
+        articles fetched again never lose the summary they were archived with.
+        """
+        # Unchanged copies are common (every feed reload); skip them without taking the lock
+        articles = [article for article in articles if self._recent.get(article.id) != _fingerprint(article)]
+        if not articles:
+            return 0
+        with self._writer():
+            articles = self._keep_summaries(articles)
+            manifest = self._read_manifest()
+            segments = manifest["segments"]
+            if not segments or segments[-1]["sealed"]:
+                segments.append(self._new_segment(manifest))
+                self._write_manifest(manifest)
+            active = segments[-1]
+
+            records = []
+            segment_path = self._path(self._segment_name(active["id"]))
+            with open(segment_path, "ab") as segment:
+                for article in articles:
+                    fingerprint = _fingerprint(article)
+                    if self._recent.get(article.id) == fingerprint:
+                        continue
+                    line = json.dumps(article.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n"
+                    records.append((
+                        _timestamp(article.published_at) or int(time.time()), segment.tell(), len(line),
+                        source_hash(article.source), int(article.id, 16),
+                    ))
+                    segment.write(line)
+                    self._remember(article.id, fingerprint)
+            if records:
+                # Index entries are written after the data they point to
+                with open(self._path(self._index_name(active["id"], False)), "ab") as log:
+                    log.write(np.array(records, dtype=INDEX_DTYPE).tobytes())
+
+            if os.path.getsize(segment_path) >= self.segment_bytes:
+                self._seal(manifest, active)
+            return len(records)
+
+    def _keep_summaries(self, articles):
+        """Articles without a summary take their stored version's; call while holding the writer lock.
+
+        Stored versions are read for articles this process has not archived
+        (or only without a summary), so unchanged copies are not written again.
+        """
+        unknown = [article.id for article in articles
+                   if article.id not in self._recent or not (article.summary or self._recent[article.id][0])]
+        for stored in self._get(unknown):
+            self._remember(stored.id, _fingerprint(stored))
+        kept = []
+        for article in articles:
+            remembered = self._recent.get(article.id)
+            if not article.summary and remembered and remembered[0]:
+                article = article.with_summary(remembered[0])
+            kept.append(article)
+        return kept
+
+    def _remember(self, article_id, fingerprint):
+        self._recent[article_id] = fingerprint
+        self._recent.move_to_end(article_id)
+        while len(self._recent) > RECENT_IDS:
+            self._recent.popitem(last=False)
+
+    def _new_segment(self, manifest):
+        segment = {"id": manifest["next_id"], "sealed": False}
+        manifest["next_id"] += 1
+        open(self._path(self._segment_name(segment["id"])), "ab").close()
+        open(self._path(self._index_name(segment["id"], False)), "ab").close()
+        return segment
+
+    def _write_index(self, segment_id, index):
+        """Write a time-sorted index for a sealed segment"""
+        index = np.sort(index, order=["ts", "offset"], kind="stable")
+        tmp_path = self._path(f"{self._index_name(segment_id, True)}.tmp")
+        index.tofile(tmp_path)
+        os.replace(tmp_path, self._path(self._index_name(segment_id, True)))
+        return index
+
+    def _seal(self, manifest, segment):
+        """Sort the active segment's index and mark it sealed; call while holding the writer lock"""
+        index = np.array(self._load_index(segment))
+        index = self._write_index(segment["id"], index)
+        segment.update(
+            sealed=True,
+            min_ts=int(index["ts"][0]) if len(index) else 0,
+            max_ts=int(index["ts"][-1]) if len(index) else 0,
+            bytes=os.path.getsize(self._path(self._segment_name(segment["id"]))),
+        )
+        self._write_manifest(manifest)
+        os.remove(self._path(self._index_name(segment["id"], False)))
+
+    # Reading
+
+    def _retrying(self, read, *args):
+        for attempt in range(3):
+            try:
+                return read(*args)
+            except FileNotFoundError:
+                # A compaction replaced segments mid-read; retry against the new manifest
+                if attempt == 2:
+                    raise
+
+    def _collect(self, select, skip=None):
+        """Index records chosen by select(index, sealed) across live segments.
+
+        Returns (records, manifest rank, segment id) arrays, or None when nothing matches.
+        """
+        parts = []
+        for rank, segment in enumerate(self._read_manifest()["segments"]):
+            if skip is not None and segment["sealed"] and skip(segment):
+                continue
+            matches = select(self._load_index(segment), segment["sealed"])
+            if len(matches):
+                parts.append((segment["id"], rank, np.array(matches)))
+        if not parts:
+            return None
+        return (
+            np.concatenate([p[2] for p in parts]),
+            np.concatenate([np.full(len(p[2]), p[1]) for p in parts]),
+            np.concatenate([np.full(len(p[2]), p[0]) for p in parts]),
+        )
+
+    def _read(self, records, segment_ids, order):
+        """Yield the articles at positions order of records"""
+        files = {}
+        try:
+            for i in order:
+                segment_id = int(segment_ids[i])
+                if segment_id not in files:
+                    files[segment_id] = open(self._path(self._segment_name(segment_id)), "rb")
+                f = files[segment_id]
+                f.seek(int(records["offset"][i]))
+                yield Article.from_dict(json.loads(f.read(int(records["length"][i]))))
+        finally:
+            for f in files.values():
+                f.close()
+
+    def query(self, start=None, end=None, source=None, limit=None):
+        """Articles published between start and end (datetimes or epoch seconds), newest first.
+
+        Only index records in the time range are examined, and only matching
+        articles are read, so memory use follows the result size.
+        """
+        return self._retrying(self._query, start, end, source, limit)
+
+    def _query(self, start, end, source, limit):
+        low = _timestamp(start) if start is not None else np.iinfo(np.int64).min
+        high = _timestamp(end) if end is not None else np.iinfo(np.int64).max
+        wanted_source = source_hash(source) if source else None
+
+        def select(index, sealed):
+            if sealed:
+                matches = index[np.searchsorted(index["ts"], low, side="left"):
+                                np.searchsorted(index["ts"], high, side="right")]
+            else:
+                matches = index[(index["ts"] >= low) & (index["ts"] <= high)]
+            if wanted_source is not None:
+                matches = matches[matches["source"] == wanted_source]
+            return matches
+
+        found = self._collect(select, skip=lambda segment: segment["max_ts"] < low or segment["min_ts"] > high)
+        if found is None:
+            return []
+        records, ranks, segment_ids = found
+        # Newest first; for repeated ids the latest segment and offset is the current version
+        order = np.lexsort((records["offset"], ranks, records["ts"]))[::-1]
+        _, first = np.unique(records["id"][order], return_index=True)
+        order = order[np.sort(first)]
+
+        articles = []
+        for article in self._read(records, segment_ids, order):
+            # The source hash can collide; confirm against the stored name
+            if source and article.source.strip().lower() != source.strip().lower():
+                continue
+            articles.append(article)
+            if limit and len(articles) >= limit:
+                break
+        return articles
+
+    def get(self, article_ids):
+        """Current versions of articles by id, in the order given; unknown ids are skipped"""
+        return self._retrying(self._get, list(article_ids))
+
+    def _get(self, article_ids):
+        if not article_ids:
+            return []
+        wanted = np.array([int(article_id, 16) for article_id in article_ids], dtype=np.uint64)
+        found = self._collect(lambda index, sealed: index[np.isin(index["id"], wanted)])
+        if found is None:
+            return []
+        records, ranks, segment_ids = found
+        order = np.lexsort((records["offset"], ranks))[::-1]
+        _, first = np.unique(records["id"][order], return_index=True)
+        by_id = {article.id: article for article in self._read(records, segment_ids, order[first])}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+    def recent(self, days=7, source=None, limit=None):
+        """Articles from the last `days` days, optionally from one source"""
+        return self.query(start=time.time() - days * 86400, source=source, limit=limit)
+
+    # Maintenance
+
+    def compact(self, now=None):
+        """Merge sealed segments, keeping the newest version of each article within retention.
+
+        Returns a dict with the number of segments merged, records kept and
+        dropped, and the ids of articles no longer archived at all.
+        """
+        now = now or time.time()
+        with self._writer():
+            manifest = self._read_manifest()
+            sealed = [s for s in manifest["segments"] if s["sealed"]]
+            if not sealed:
+                return {"segments": 0, "kept": 0, "dropped": 0, "removed": []}
+
+            parts = [(rank, s, np.array(self._load_index(s))) for rank, s in enumerate(sealed)]
+            records = np.concatenate([p[2] for p in parts])
+            ranks = np.concatenate([np.full(len(p[2]), p[0]) for p in parts])
+            total = len(records)
+
+            # Newest version of each id, then age retention
+            order = np.lexsort((records["offset"], ranks))[::-1]
+            _, first = np.unique(records["id"][order], return_index=True)
+            keep = order[first]
+            keep = keep[records["ts"][keep] >= now - self.max_age]
+            # Size retention: oldest articles go first, leaving room for the active segment
+            active_bytes = sum(os.path.getsize(self._path(self._segment_name(s["id"])))
+                               for s in manifest["segments"] if not s["sealed"])
+            keep = keep[np.argsort(records["ts"][keep], kind="stable")[::-1]]
+            sizes = np.cumsum(records["length"][keep].astype(np.int64))
+            keep = keep[sizes <= max(0, self.max_bytes - active_bytes)]
+
+            merged = {"id": manifest["next_id"], "sealed": True}
+            manifest["next_id"] += 1
+            new_records = []
+            tmp_path = self._path(f"{self._segment_name(merged['id'])}.tmp")
+            with open(tmp_path, "wb") as out:
+                sources = {}
+                try:
+                    for i in keep[np.argsort(records["ts"][keep], kind="stable")]:
+                        segment = parts[int(ranks[i])][1]
+                        if segment["id"] not in sources:
+                            sources[segment["id"]] = open(self._path(self._segment_name(segment["id"])), "rb")
+                        f = sources[segment["id"]]
+                        f.seek(int(records["offset"][i]))
+                        data = f.read(int(records["length"][i]))
+                        new_records.append((records["ts"][i], out.tell(), len(data), records["source"][i], records["id"][i]))
+                        out.write(data)
+                finally:
+                    for f in sources.values():
+                        f.close()
+            os.replace(tmp_path, self._path(self._segment_name(merged["id"])))
+            index = self._write_index(merged["id"], np.array(new_records, dtype=INDEX_DTYPE))
+            merged.update(
+                min_ts=int(index["ts"][0]) if len(index) else 0,
+                max_ts=int(index["ts"][-1]) if len(index) else 0,
+                bytes=os.path.getsize(self._path(self._segment_name(merged["id"]))),
+            )
+
+            # Articles past retention that have no newer copy in the active segment are gone for good
+            active_ids = [np.array(self._load_index(s))["id"] for s in manifest["segments"] if not s["sealed"]]
+            removed = np.setdiff1d(np.setdiff1d(records["id"], records["id"][keep]),
+                                   np.concatenate(active_ids) if active_ids else np.zeros(0, dtype=np.uint64))
+
+            # The merged segment takes the place of its inputs, ahead of the active one
+            manifest["segments"] = [merged] + [s for s in manifest["segments"] if not s["sealed"]]
+            self._write_manifest(manifest)
+            for segment in sealed:
+                for name in (self._segment_name(segment["id"]), self._index_name(segment["id"], True)):
+                    try:
+                        os.remove(self._path(name))
+                    except FileNotFoundError:
+                        pass
+            return {"segments": len(sealed), "kept": len(new_records), "dropped": total - len(new_records),
+                    "removed": [f"{int(article_id):016x}" for article_id in removed]}
+
+    def seal(self):
+        """Seal the active segment now, e.g. before compacting a quiet archive"""
+        with self._writer():
+            manifest = self._read_manifest()
+            if manifest["segments"] and not manifest["segments"][-1]["sealed"]:
+                self._seal(manifest, manifest["segments"][-1])
+
+    def start_compactor(self, interval=DEFAULT_COMPACT_INTERVAL, on_removed=None):
+        """Seal and compact on a background thread every interval seconds.
+
+        on_removed, if given, is called with the ids of articles compaction dropped.
+        """
+        if self._compactor is not None:
+            return
+
+        def run():
+            while not self._stopped.wait(interval):
+                try:
+                    self.seal()
+                    removed = self.compact()["removed"]
+                    if removed and on_removed is not None:
+                        on_removed(removed)
+                except Exception:
+                    pass  # Retried next interval
+
+        self._compactor = threading.Thread(target=run, name="archive-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def stats(self):
+        manifest = self._read_manifest()
+        sizes = [os.path.getsize(self._path(self._segment_name(s["id"]))) for s in manifest["segments"]]
+        return {"segments": len(sizes), "bytes": sum(sizes),
+                "sealed": sum(1 for s in manifest["segments"] if s["sealed"])}
@@ -2,10 +2,12 @@
 Authentication Component for Tech News App
 """
 import streamlit as st
-import requests
 import json
 import os
+import time
+import http_client
 from firebase_config import initialize_firebase, verify_token, get_user_data, save_user_data
+from token_manager import TokenManager
 
 # Firebase Web API Key (for client-side auth)
 try:
@@ -13,6 +15,9 @@ try:
 except:
     FIREBASE_WEB_API_KEY = os.getenv("FIREBASE_WEB_API_KEY")
 
+# Process-wide manager that refreshes ID tokens before they expire
+token_manager = TokenManager(FIREBASE_WEB_API_KEY)
+
 def show_login_form():
     """Display login form"""
     st.markdown("""
@@ -53,16 +58,20 @@ def authenticate_user(email, password, is_register=False):
     }
     
     try:
-        response = requests.post(auth_url, json=payload)
+        # Registration is not idempotent, so only sign-in is retried
+        response = http_client.post(auth_url, json=payload, retries=0 if is_register else None)
         
         if response.status_code == 200:
             data = response.json()
-            return {
+            user_data = {
                 'uid': data['localId'],
                 'email': data['email'],
                 'id_token': data['idToken'],
-                'refresh_token': data['refreshToken']
+                'refresh_token': data['refreshToken'],
+                'expires_at': time.time() + int(data.get('expiresIn', 3600))
             }
+            token_manager.track(user_data)
+            return user_data
         else:
             error_data = response.json()
             st.error(f"Authentication failed: {error_data.get('error', {}).get('message', 'Unknown error')}")
@@ -84,6 +93,7 @@ def show_user_profile(user_data):
         """.format(user_data.get('email', 'Unknown')), unsafe_allow_html=True)
         
         if st.button("🚪 Logout", use_container_width=True):
+            token_manager.untrack(user_data.get('uid'))
             st.session_state.clear()
             st.rerun()
 
@@ -92,9 +102,10 @@ def check_authentication():
     if 'user' not in st.session_state:
         return False
     
-    # Verify token is still valid
+    # Verify token is still valid, refreshing it first if it is about to expire
     try:
-        decoded_token = verify_token(st.session_state['user']['id_token'])
+        user = token_manager.ensure_fresh(st.session_state['user'])
+        decoded_token = verify_token(user['id_token'])
         if decoded_token:
             return True
     except:
@@ -104,6 +115,11 @@ def check_authentication():
     st.session_state.clear()
     return False
 
+def sync_session_tokens():
+    """Swap in ID tokens refreshed in the background, without any network call"""
+    if 'user' in st.session_state:
+        token_manager.sync(st.session_state['user'])
+
 def require_auth():
     """Decorator to require authentication"""
     if not check_authentication():
@@ -0,0 +1,68 @@
+"""
+Measure the memory footprint of Article records vs. raw NewsAPI dicts.
+
+Usage: python benchmarks/bench_article_memory.py [--count 100000]
+
+Both pools are built from the same JSON payload, as if decoded from
+NewsAPI responses, and measured with tracemalloc.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Article
+
+SOURCES = ["The Verge", "Engadget", "TechCrunch", "Wired", "Ars Technica", "CNBC", "Reuters", "BBC News"]
+
+
+def make_payload(count, seed=3):
+    rng = random.Random(seed)
+    articles = [{
+        "source": {"id": None, "name": rng.choice(SOURCES)},
+        "author": f"Author {rng.randrange(200)}",
+        "title": f"Story {n} about chips, models and the cloud",
+        "description": "A short description of the story that NewsAPI returned for this article.",
+        "url": f"https://example.com/news/{n}",
+        "urlToImage": f"https://example.com/images/{n}.jpg",
+        "publishedAt": f"2025-0{1 + n % 9}-1{n % 10}T12:{n % 60:02d}:00Z",
+        "content": "Truncated article content from NewsAPI... [+2000 chars]",
+    } for n in range(count)]
+    return json.dumps(articles)
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    pool = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pool, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    payload = make_payload(args.count)
+    raw, raw_bytes, raw_seconds = measure(lambda: json.loads(payload))
+    del raw
+    articles, article_bytes, article_seconds = measure(
+        lambda: [Article.from_newsapi(a) for a in json.loads(payload)]
+    )
+
+    print(f"{args.count} articles")
+    print(f"raw dicts: {raw_bytes / 1e6:8.1f} MB  {raw_bytes / args.count:6.0f} B/article  {raw_seconds:.2f}s to build")
+    print(f"Article:   {article_bytes / 1e6:8.1f} MB  {article_bytes / args.count:6.0f} B/article  {article_seconds:.2f}s to build")
+    print(f"saved:     {100 * (1 - article_bytes / raw_bytes):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare per-article and batched OpenRouter summarization.
+
+Usage: python benchmarks/bench_batch_summaries.py [--articles 15] [--batch-size 5]
+
+Needs OPENROUTER_API_KEY; uses NEWS_API_KEY for live headlines when set.
+The summary cache is disabled so every run hits the API.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+from models import Article
+from news_client import fetch_top_headlines
+from summarizer import SummarizationEngine
+
+SAMPLE_ARTICLES = [
+    {"title": f"Sample tech story {n}",
+     "description": f"Company {n} announced a new product line aimed at developers, "
+                    f"promising faster builds and better tooling across its cloud platform."}
+    for n in range(1, 16)
+]
+
+
+def load_articles(count):
+    """Fetch live headlines if possible, otherwise use the built-in sample"""
+    articles, _ = fetch_top_headlines(os.getenv("NEWS_API_KEY"))
+    return [Article.from_newsapi(a) for a in (articles or SAMPLE_ARTICLES)[:count]]
+
+
+def run(engine, articles):
+    started = time.monotonic()
+    results = engine.summarize_many(articles)
+    return time.monotonic() - started, sum(1 for r in results if r.ok)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=5)
+    args = parser.parse_args()
+
+    load_dotenv()
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if not api_key:
+        sys.exit("OPENROUTER_API_KEY is not set")
+
+    articles = load_articles(args.articles)
+    print(f"{len(articles)} articles")
+    print(f"{'mode':<8} {'wall s':>8} {'ok':>4} {'requests':>9} {'prompt tok':>11} {'compl tok':>10} {'tok/article':>12}")
+    for mode, batch_size in (("single", 1), ("batch", args.batch_size)):
+        engine = SummarizationEngine(api_key, cache=None, batch_size=batch_size)
+        wall, ok = run(engine, articles)
+        stats = engine.metrics.snapshot()
+        # Batch runs may fall back to single requests; report the sum of both
+        requests_made = sum(s["requests"] for s in stats.values())
+        prompt = sum(s["prompt_tokens"] for s in stats.values())
+        completion = sum(s["completion_tokens"] for s in stats.values())
+        print(f"{mode:<8} {wall:>8.2f} {ok:>4} {requests_made:>9} {prompt:>11} {completion:>10} "
+              f"{(prompt + completion) / max(len(articles), 1):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
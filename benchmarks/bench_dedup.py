@@ -0,0 +1,76 @@
+"""
+Benchmark near-duplicate clustering and the LLM calls it saves.
+
+Usage: python benchmarks/bench_dedup.py [--sizes 100 1000 10000] [--dup-rate 0.3]
+
+Builds synthetic feeds where a share of stories is re-published by other
+outlets with small edits, then reports clustering time, candidate pairs
+compared and summaries saved (one per cluster instead of one per article).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import cluster
+from models import Article
+
+WORDS = ("apple google microsoft nvidia openai chip model launch cloud startup funding security "
+         "breach update release phone laptop ai robot battery quantum network data privacy court "
+         "regulator deal acquisition revenue growth developers platform gpu datacenter").split()
+OUTLETS = ["The Verge", "Engadget", "TechCrunch", "Wired", "Ars Technica", "CNBC", "Reuters"]
+
+
+def make_story(rng):
+    title = " ".join(rng.choice(WORDS) for _ in range(8))
+    description = " ".join(rng.choice(WORDS) for _ in range(30))
+    return title, description
+
+
+def perturb(rng, text):
+    words = text.split()
+    for _ in range(max(1, len(words) // 10)):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def make_feed(size, dup_rate, seed=7):
+    """Return (articles, true_story_count)"""
+    rng = random.Random(seed)
+    articles, stories = [], 0
+    while len(articles) < size:
+        title, description = make_story(rng)
+        stories += 1
+        copies = 1 + (rng.randint(1, 4) if rng.random() < dup_rate else 0)
+        for _ in range(copies):
+            articles.append(Article.from_newsapi({
+                "title": perturb(rng, title),
+                "description": perturb(rng, description),
+                "source": {"name": rng.choice(OUTLETS)},
+                "url": f"https://example.com/{len(articles)}",
+            }))
+    return articles[:size], stories
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--dup-rate", type=float, default=0.3)
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} {'stories':>8} {'clusters':>9} {'LLM calls saved':>16} {'saved %':>8} {'ms':>9}")
+    for size in args.sizes:
+        articles, stories = make_feed(size, args.dup_rate)
+        started = time.perf_counter()
+        groups = cluster(articles)
+        elapsed = (time.perf_counter() - started) * 1000
+        saved = len(articles) - len(groups)
+        print(f"{len(articles):>9} {stories:>8} {len(groups):>9} {saved:>16} "
+              f"{100 * saved / len(articles):>7.1f}% {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark the local extractive summarizer.
+
+Usage: python benchmarks/bench_local_summarizer.py [--articles 2000] [--sentences 3 8 20]
+
+Summarizes synthetic articles of several lengths with the TextRank
+summarizer (bypassing its result cache) and reports articles per second
+and per-article latency.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_summarizer import summarize_locally
+
+WORDS = ("apple google microsoft nvidia openai chip model launch cloud startup funding security "
+         "breach update release phone laptop ai robot battery quantum network data privacy court "
+         "regulator deal acquisition revenue growth developers platform gpu datacenter").split()
+
+
+def make_article(rng, sentences):
+    title = " ".join(rng.choice(WORDS) for _ in range(8)).capitalize()
+    description = " ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        for _ in range(sentences)
+    )
+    return title, description
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--sentences", type=int, nargs="+", default=[3, 8, 20])
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    summarize = summarize_locally.__wrapped__
+    print(f"{'sentences':>9} {'articles':>9} {'articles/s':>11} {'ms/article':>11}")
+    for sentences in args.sentences:
+        articles = [make_article(rng, sentences) for _ in range(args.articles)]
+        started = time.perf_counter()
+        for title, description in articles:
+            summarize(title, description)
+        elapsed = time.perf_counter() - started
+        print(f"{sentences:>9} {len(articles):>9} {len(articles) / elapsed:>11.0f} {1000 * elapsed / len(articles):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark personalized ranking of large candidate lists.
+
+Usage: python benchmarks/bench_ranking.py [--sizes 1000 10000] [--clicks 30] [--repeat 20]
+
+Trains an interest profile on clicks on one topic, then reports
+featurization time of new articles, ranking time for a new candidate list
+and for one seen before (reruns of the same feed), the stored profile size
+and how many of the top 20 ranked articles are on the clicked topic.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from models import Article
+from personalization import InterestProfile, featurize, rank, _features, _candidates
+
+TOPICS = {
+    "chips": "nvidia amd intel chip gpu semiconductor foundry wafer tsmc datacenter accelerator".split(),
+    "phones": "apple iphone android samsung pixel smartphone camera battery galaxy ios".split(),
+    "policy": "regulator court antitrust lawsuit privacy ftc eu fine ruling senate".split(),
+    "space": "rocket spacex nasa orbit satellite launch moon mars starship booster".split(),
+}
+FILLER = "company new report week says users market update plans deal growth launch today".split()
+OUTLETS = ["The Verge", "Engadget", "TechCrunch", "Wired", "Ars Technica", "CNBC", "Reuters"]
+
+
+def make_articles(size, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    articles = []
+    for n in range(size):
+        topic = rng.choice(list(TOPICS))
+        words = lambda count: " ".join(rng.choice(TOPICS[topic] if rng.random() < 0.4 else FILLER) for _ in range(count))
+        articles.append((topic, Article.from_newsapi({
+            "title": words(9),
+            "description": words(35),
+            "source": {"name": rng.choice(OUTLETS)},
+            "url": f"https://example.com/{n}",
+            "publishedAt": (now - timedelta(minutes=rng.randrange(72 * 60))).isoformat(),
+        })))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--clicks", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} {'featurize ms':>13} {'rank new ms':>12} {'rank ms':>8} {'profile B':>10} {'top-20 on topic':>16}")
+    for size in args.sizes:
+        labelled = make_articles(size)
+        articles = [article for _, article in labelled]
+        profile = InterestProfile()
+        for _, article in [pair for pair in labelled if pair[0] == "chips"][:args.clicks]:
+            profile.learn(article)
+        # Round-trip through the stored form, as the app does
+        doc = profile.to_doc()
+        profile = InterestProfile.from_doc(doc)
+
+        _features.cache_clear()
+        started = time.perf_counter()
+        featurize(articles)
+        cold = (time.perf_counter() - started) * 1000
+        _candidates.clear()
+        started = time.perf_counter()
+        rank(articles, profile)
+        new = (time.perf_counter() - started) * 1000
+
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            ranked = rank(articles, profile)
+            timings.append((time.perf_counter() - started) * 1000)
+        topic_of = {article.id: topic for topic, article in labelled}
+        on_topic = sum(1 for article in ranked[:20] if topic_of[article.id] == "chips")
+        print(f"{size:>9} {cold:>13.1f} {new:>12.1f} {np.median(timings):>8.1f} "
+              f"{len(json.dumps(doc)):>10} {on_topic:>13}/20")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare bytes, elements and build time of the feed renderer with the
+previous per-element rendering.
+
+Usage: python benchmarks/bench_render.py [--cards 15] [--reruns 20]
+
+The legacy numbers rebuild the HTML strings the old app.py loop sent (five
+st.markdown calls plus one st.image per card). Bytes are the Markdown
+payloads only; websocket framing is the same per element for both.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Article
+from ui_components import render_card_html, render_feed_html
+
+
+def make_articles(count):
+    return [Article.from_newsapi({
+        "title": f"Story {n}: chipmaker unveils a faster accelerator for AI training",
+        "description": "The company says the new part doubles throughput while cutting power use.",
+        "url": f"https://example.com/news/{n}",
+        "urlToImage": f"https://example.com/images/{n}.jpg",
+        "source": {"name": "TechCrunch"},
+        "publishedAt": "2025-06-01T12:00:00Z",
+    }).with_summary("A two to three sentence AI summary of the story, as returned by OpenRouter for the digest.")
+        for n in range(count)]
+
+
+def legacy_payloads(article, i):
+    """The Markdown/image payloads the previous loop emitted for one card"""
+    pub_date = datetime.fromisoformat("2025-06-01T12:00:00+00:00")
+    return [
+        f"""
+        <div class="news-card">
+            <div style="display: flex; align-items: center; margin-bottom: 1rem;">
+                <span style="background: linear-gradient(45deg, #8b5cf6, #a855f7); 
+                            color: #ffffff; padding: 0.3rem 0.8rem; border-radius: 20px; 
+                            font-weight: 700; font-family: 'Orbitron', monospace; 
+                            font-size: 0.9rem; margin-right: 1rem;">
+                    #{i}
+                </span>
+                <h3 style="margin: 0; color: #8b5cf6; font-family: 'Orbitron', monospace;">
+                    {article.title}
+                </h3>
+            </div>
+        </div>
+        """,
+        article.image_url,
+        f"""
+            <div style="background: rgba(248, 244, 255, 0.5); padding: 0.5rem 1rem; 
+                        border-radius: 8px; border-left: 3px solid #8b5cf6; margin: 1rem 0;">
+                <p style="color: #6b7280; margin: 0; font-size: 0.9rem;">
+                    📅 Published: {pub_date.strftime('%Y-%m-%d %H:%M')} | 
+                    📡 Source: {article.source}
+                </p>
+            </div>
+            """,
+        f"""
+        <div style="background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(168, 85, 247, 0.1));
+                    border: 1px solid #8b5cf6; border-radius: 10px; padding: 1rem; margin: 1rem 0;">
+            <h4 style="color: #8b5cf6; margin: 0 0 0.5rem 0; font-family: 'Orbitron', monospace;">
+                🤖 AI ANALYSIS
+            </h4>
+            <p style="color: #4a4a4a; margin: 0; line-height: 1.6;">
+                {article.summary}
+            </p>
+        </div>
+        """,
+        f"""
+            <div style="text-align: center; margin: 1rem 0;">
+                <a href="{article.url}" target="_blank" 
+                   style="display: inline-block; background: linear-gradient(45deg, #ec4899, #f472b6);
+                          color: #ffffff; padding: 0.5rem 1.5rem; border-radius: 25px; 
+                          text-decoration: none; font-weight: 600; font-family: 'Orbitron', monospace;
+                          transition: all 0.3s ease; box-shadow: 0 4px 15px rgba(236, 72, 153, 0.3);">
+                    🔗 ACCESS FULL ARTICLE
+                </a>
+            </div>
+            """,
+        "---",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cards", type=int, default=15)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+    articles = make_articles(args.cards)
+
+    started = time.perf_counter()
+    for _ in range(args.reruns):
+        legacy = [p for i, a in enumerate(articles, 1) for p in legacy_payloads(a, i)]
+    legacy_ms = (time.perf_counter() - started) * 1000 / args.reruns
+    legacy_bytes = sum(len(p.encode("utf-8")) for p in legacy)
+
+    render_card_html.cache_clear()
+    started = time.perf_counter()
+    feed = render_feed_html(articles)
+    cold_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for _ in range(args.reruns):
+        feed = render_feed_html(articles)
+    warm_ms = (time.perf_counter() - started) * 1000 / args.reruns
+    feed_bytes = len(feed.encode("utf-8"))
+
+    print(f"{args.cards} cards per rerun")
+    print(f"legacy:  {len(legacy):>3} elements  {legacy_bytes / 1024:7.1f} KB  {legacy_ms:6.2f} ms build")
+    print(f"batched: {1:>3} elements  {feed_bytes / 1024:7.1f} KB  {cold_ms:6.2f} ms cold, {warm_ms:6.3f} ms cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark full-text search over an archive-sized index.
+
+Usage: python benchmarks/bench_search.py [--sizes 10000 100000] [--queries 500]
+
+Builds synthetic articles whose words follow a Zipf distribution over a
+20k-word vocabulary, then reports index build, save and load time, and
+query latency percentiles for one- to three-word queries.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from models import Article
+from search_index import SearchIndex
+
+VOCABULARY = 20000
+OUTLETS = ["The Verge", "Engadget", "TechCrunch", "Wired", "Ars Technica", "CNBC", "Reuters"]
+
+
+def make_words(rng, count):
+    """Zipf-distributed word ids rendered as pseudo words"""
+    return [f"w{i}x{i % 7}" for i in np.minimum(rng.zipf(1.2, size=count), VOCABULARY)]
+
+
+def make_articles(size, seed=7):
+    rng = np.random.default_rng(seed)
+    articles = []
+    for n in range(size):
+        articles.append(Article.from_newsapi({
+            "title": " ".join(make_words(rng, 10)),
+            "description": " ".join(make_words(rng, 40)),
+            "source": {"name": OUTLETS[n % len(OUTLETS)]},
+            "url": f"https://example.com/{n}",
+        }).with_summary(" ".join(make_words(rng, 30)) if n % 2 else None))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    queries = [" ".join(make_words(rng, int(rng.integers(1, 4)))) for _ in range(args.queries)]
+
+    print(f"{'articles':>9} {'build s':>8} {'save ms':>8} {'load ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+    for size in args.sizes:
+        articles = make_articles(size)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "search.npz")
+            index = SearchIndex(path)
+            started = time.perf_counter()
+            index.add(articles)
+            index.save()
+            build = time.perf_counter() - started
+
+            started = time.perf_counter()
+            index.save()
+            save = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            index = SearchIndex(path)
+            load = (time.perf_counter() - started) * 1000
+
+            latencies = []
+            for query in queries:
+                started = time.perf_counter()
+                index.search(query)
+                latencies.append((time.perf_counter() - started) * 1000)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            print(f"{size:>9} {build:>8.1f} {save:>8.0f} {load:>8.0f} {p50:>7.2f} {p95:>7.2f} {p99:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Circuit Breaker and Adaptive Timeouts for Tech News App
+
+One CircuitBreaker per endpoint host. After repeated failures, or when
+successful responses become very slow, the circuit opens and requests fail
+immediately instead of each waiting out a timeout. After a cooldown one
+probe request is let through (half-open); its outcome closes the circuit
+or reopens it for twice as long. Read timeouts follow the host's recent
+latency instead of a fixed worst case.
+
+Latencies are kept per request kind, because a streamed response (timed to
+its headers) or a batch completion says nothing about how long an ordinary
+request takes. Only ordinary requests are judged for slowness.
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5  # Consecutive failures that open the circuit
+DEFAULT_SLOW_THRESHOLD = 15.0  # Median latency in seconds treated as an outage
+DEFAULT_COOLDOWN = 30.0
+DEFAULT_MAX_COOLDOWN = 300.0
+DEFAULT_WINDOW = 50  # Recent latencies kept per host
+DEFAULT_TIMEOUT_MULTIPLIER = 3.0
+DEFAULT_MIN_TIMEOUT = 3.0
+MIN_SAMPLES = 10  # Latencies needed before adapting or judging slowness
+DEFAULT_KIND = "request"
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a non-empty sequence"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open breaker with a latency window per request kind"""
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, slow_threshold=DEFAULT_SLOW_THRESHOLD,
+                 cooldown=DEFAULT_COOLDOWN, max_cooldown=DEFAULT_MAX_COOLDOWN, window=DEFAULT_WINDOW,
+                 timeout_multiplier=DEFAULT_TIMEOUT_MULTIPLIER, min_timeout=DEFAULT_MIN_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.slow_threshold = slow_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probing = False
+        self._latencies = {}
+        self._counters = {"opened": 0, "short_circuited": 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._open_until:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Whether a request may be sent now. In half-open state only one probe is allowed."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._open_until:
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._counters["short_circuited"] += 1
+            return False
+
+    def _open(self):
+        """Open the circuit; call with self._lock held"""
+        if self._state == HALF_OPEN:
+            self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+        self._state = OPEN
+        self._open_until = time.monotonic() + self._cooldown
+        self._probing = False
+        self._latencies.clear()
+        self._counters["opened"] += 1
+
+    def _samples(self, kind):
+        """Latency window of a request kind; call with self._lock held"""
+        samples = self._latencies.get(kind)
+        if samples is None:
+            samples = self._latencies[kind] = deque(maxlen=self.window)
+        return samples
+
+    def record_success(self, latency, kind=DEFAULT_KIND):
+        with self._lock:
+            self._failures = 0
+            samples = self._samples(kind)
+            samples.append(latency)
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._cooldown = self.base_cooldown
+                self._probing = False
+            elif (self._state == CLOSED and kind == DEFAULT_KIND and len(samples) >= MIN_SAMPLES
+                  and percentile(samples, 0.5) > self.slow_threshold):
+                self._open()
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._open()
+
+    def timeout(self, ceiling, kind=DEFAULT_KIND):
+        """Read timeout for the next request of a kind: a multiple of its recent p99 latency, at most ceiling"""
+        with self._lock:
+            samples = self._latencies.get(kind)
+            if samples is None or len(samples) < MIN_SAMPLES:
+                return ceiling
+            p99 = percentile(samples, 0.99)
+        return min(ceiling, max(self.min_timeout, p99 * self.timeout_multiplier))
+
+    def retry_in(self):
+        """Seconds until an open circuit lets a probe through, or 0"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["state"] = self._state
+            stats["consecutive_failures"] = self._failures
+            latencies = {kind: list(samples) for kind, samples in self._latencies.items() if samples}
+        for kind, samples in latencies.items():
+            adaptive = self.timeout(float("inf"), kind)
+            stats[kind] = {
+                "p50_ms": 1000 * percentile(samples, 0.5),
+                "p99_ms": 1000 * percentile(samples, 0.99),
+                "adaptive_timeout": None if adaptive == float("inf") else adaptive,
+            }
+        return stats
@@ -0,0 +1,126 @@
+"""
+Near-Duplicate Story Detection for Tech News App
+
+Articles are turned into MinHash signatures over word shingles of their
+normalized title and description. LSH banding only compares articles that
+share a band bucket, so clustering stays sub-quadratic as the pool grows.
+"""
+import hashlib
+import random
+import re
+from collections import defaultdict
+from dataclasses import replace
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 32  # 32 bands x 2 rows: pairs at 0.4 Jaccard become candidates >99% of the time
+DEFAULT_THRESHOLD = 0.4
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+# Function words shared by unrelated stories would inflate similarity
+_STOPWORDS = frozenset("a an and are as at be by for from has in is it its of on or that the to was were will with".split())
+
+
+def normalize(text):
+    """Lowercase, strip punctuation and drop stopwords"""
+    words = _NON_WORD_RE.sub(" ", (text or "").lower()).split()
+    return [w for w in words if w not in _STOPWORDS]
+
+
+def shingles(article, size=2):
+    """Word shingles of an article's normalized title and description"""
+    words = normalize(f"{article.title} {article.description}")
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+class MinHasher:
+    """Fixed-seed universal hash family producing MinHash signatures"""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                        for _ in range(num_perm)]
+
+    def signature(self, tokens):
+        """MinHash signature of a set of tokens, as a tuple of ints"""
+        if not tokens:
+            return (_MAX_HASH,) * self.num_perm
+        hashes = [_hash(t) for t in tokens]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        )
+
+
+def estimated_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def cluster(articles, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS, hasher=None):
+    """Group near-duplicate articles. Returns lists of indexes into articles, in input order."""
+    hasher = hasher or MinHasher(num_perm)
+    rows = hasher.num_perm // bands
+    signatures = [hasher.signature(shingles(a)) for a in articles]
+
+    parent = list(range(len(articles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        if sig[0] == _MAX_HASH and len(set(sig)) == 1:
+            continue  # Nothing to compare on
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(i)
+
+    # Compare each bucket member with the bucket's first member only; true
+    # duplicates share several bands, so transitive links are still found
+    checked = set()
+    for members in buckets.values():
+        first = members[0]
+        for j in members[1:]:
+            if (first, j) in checked or find(first) == find(j):
+                continue
+            checked.add((first, j))
+            if estimated_similarity(signatures[first], signatures[j]) >= threshold:
+                parent[find(j)] = find(first)
+
+    groups = defaultdict(list)
+    for i in range(len(articles)):
+        groups[find(i)].append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def dedupe_articles(articles, threshold=DEFAULT_THRESHOLD):
+    """Keep one representative per story, listing the other outlets in also_reported_by.
+
+    The representative is a copy that is already summarized if there is
+    one, otherwise the one with the longest description so the summarizer
+    gets the most context. It takes the position of the story's first
+    appearance. Running this again on its own output is safe.
+    """
+    representatives = []
+    for group in cluster(articles, threshold=threshold):
+        members = [articles[i] for i in group]
+        best = max(members, key=lambda a: (bool(a.summary), len(a.description)))
+        others = list(best.also_reported_by)
+        for article in members:
+            if article is best:
+                continue
+            others.append((article.source, article.url))
+            others.extend(article.also_reported_by)
+        representatives.append(replace(best, also_reported_by=tuple(others)) if others else best)
+    return representatives
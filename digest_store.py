@@ -0,0 +1,48 @@
+"""
+Precomputed News Digest Store for Tech News App
+"""
+import json
+import os
+import tempfile
+import time
+
+from models import Article
+
+DEFAULT_DIGEST_PATH = os.path.join(".cache", "digest.json")
+DEFAULT_MAX_AGE = 6 * 3600  # Ignore digests older than six hours
+
+
+def write_digest(articles, path=DEFAULT_DIGEST_PATH):
+    """Atomically write a ready-to-render digest of Articles with their summaries"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    digest = {"generated_at": time.time(), "articles": [article.to_dict() for article in articles]}
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".digest-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(digest, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_digest(path=DEFAULT_DIGEST_PATH, max_age=DEFAULT_MAX_AGE):
+    """Return the digest dict with Article objects, or None if it is missing, unreadable or too old"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            digest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if max_age and time.time() - digest.get("generated_at", 0) > max_age:
+        return None
+    if not digest.get("articles"):
+        return None
+    try:
+        digest["articles"] = [Article.from_dict(article) for article in digest["articles"]]
+    except (KeyError, TypeError, ValueError):
+        return None  # Written by an older version; the worker replaces it on its next run
+    return digest
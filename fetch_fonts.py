@@ -0,0 +1,49 @@
+"""
+Font Downloader for Tech News App
+
+Downloads the latin subset of the theme fonts from Google Fonts into
+static/fonts so they are served by the app itself instead of a
+third-party stylesheet on every page load.
+
+Run with: python fetch_fonts.py
+"""
+import os
+import re
+
+import http_client
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "fonts")
+GOOGLE_FONTS_CSS = "https://fonts.googleapis.com/css2"
+# Family query -> file name listed in ui_components.THEME_FONTS
+FONTS = {
+    "Orbitron:wght@400..900": "orbitron-latin.woff2",
+    "Exo 2:wght@300..700": "exo2-latin.woff2",
+}
+# Google Fonts only serves woff2 to browsers it recognizes
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+_LATIN_FACE_RE = re.compile(r"/\* latin \*/\s*@font-face\s*\{[^}]*?url\((?P<url>[^)]+)\)", re.S)
+
+
+def latin_font_url(family):
+    """URL of the latin woff2 file Google Fonts serves for a family query"""
+    response = http_client.get(GOOGLE_FONTS_CSS, params={"family": family, "display": "swap"},
+                               headers={"User-Agent": USER_AGENT})
+    response.raise_for_status()
+    match = _LATIN_FACE_RE.search(response.text)
+    if not match:
+        raise RuntimeError(f"No latin font file found for {family}")
+    return match.group("url").strip("'\"")
+
+
+def main():
+    os.makedirs(FONT_DIR, exist_ok=True)
+    for family, filename in FONTS.items():
+        response = http_client.get(latin_font_url(family))
+        response.raise_for_status()
+        with open(os.path.join(FONT_DIR, filename), "wb") as f:
+            f.write(response.content)
+        print(f"{filename}: {len(response.content)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,38 @@ Firebase Configuration and Authentication
 import streamlit as st
 import firebase_admin
 from firebase_admin import credentials, auth, firestore
+from google.auth import jwt as google_jwt
 import json
 import os
 from dotenv import load_dotenv
+from token_cache import CertificateCache, VerifiedTokenCache
+from user_store import UserDataStore, DEFAULT_CACHE_TTL, DEFAULT_FLUSH_INTERVAL
 
 # Load environment variables
 load_dotenv()
 
+# Process-wide caches so warm sessions skip signature verification
+certificate_cache = CertificateCache()
+token_cache = VerifiedTokenCache()
+
+# Process-wide Firestore client with cached reads and batched writes.
+# Point FIRESTORE_EMULATOR_HOST at the emulator to develop locally.
+user_store = UserDataStore(
+    firestore.client,
+    cache_ttl=float(os.getenv("USER_DATA_CACHE_TTL", DEFAULT_CACHE_TTL)),
+    flush_interval=float(os.getenv("USER_DATA_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)),
+)
+
 # Initialize Firebase Admin SDK
-def initialize_firebase():
-    """Initialize Firebase Admin SDK"""
+def initialize_firebase(show_errors=True):
+    """Initialize Firebase Admin SDK. Returns whether it is ready; show_errors=False fails quietly."""
     if not firebase_admin._apps:
         # Get Firebase service account key from environment
         firebase_key = os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY")
         
         if not firebase_key:
-            st.error("Firebase service account key not found. Please set FIREBASE_SERVICE_ACCOUNT_KEY in your .env file")
+            if show_errors:
+                st.error("Firebase service account key not found. Please set FIREBASE_SERVICE_ACCOUNT_KEY in your .env file")
             return False
         
         try:
@@ -27,17 +43,47 @@ def initialize_firebase():
             service_account_info = json.loads(firebase_key)
             cred = credentials.Certificate(service_account_info)
             firebase_admin.initialize_app(cred)
+            certificate_cache.prefetch()
             return True
         except Exception as e:
-            st.error(f"Failed to initialize Firebase: {e}")
+            if show_errors:
+                st.error(f"Failed to initialize Firebase: {e}")
             return False
     return True
 
 # Authentication functions
+def _project_id():
+    """Firebase project ID of the default app, if known"""
+    try:
+        return firebase_admin.get_app().project_id
+    except Exception:
+        return None
+
+def _verify_with_cached_certs(token):
+    """Verify an ID token against the cached Google certificates, or return None to defer to firebase_admin"""
+    project_id = _project_id()
+    if not project_id:
+        return None
+    
+    decoded_token = google_jwt.decode(token, certs=certificate_cache.get(), audience=project_id)
+    if decoded_token.get("iss") != f"https://securetoken.google.com/{project_id}":
+        raise ValueError("ID token has an incorrect issuer")
+    if not decoded_token.get("sub"):
+        raise ValueError("ID token has no subject")
+    decoded_token.setdefault("uid", decoded_token["sub"])
+    return decoded_token
+
 def verify_token(token):
     """Verify Firebase ID token"""
+    decoded_token = token_cache.get(token)
+    if decoded_token is not None:
+        return decoded_token
+    
     try:
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = _verify_with_cached_certs(token)
+        if decoded_token is None:
+            decoded_token = auth.verify_id_token(token)
+        token_cache.put(token, decoded_token)
         return decoded_token
     except Exception as e:
         st.error(f"Token verification failed: {e}")
@@ -46,26 +92,16 @@ def verify_token(token):
 def get_user_data(uid):
     """Get user data from Firestore"""
     try:
-        db = firestore.client()
-        user_ref = db.collection('users').document(uid)
-        user_doc = user_ref.get()
-        
-        if user_doc.exists:
-            return user_doc.to_dict()
-        return None
+        return user_store.get(uid)
     except Exception as e:
         st.error(f"Failed to get user data: {e}")
         return None
 
 def save_user_data(uid, user_data):
-    """Save user data to Firestore"""
+    """Save user data to Firestore (merged and written in the background)"""
     try:
-        db = firestore.client()
-        user_ref = db.collection('users').document(uid)
-        user_ref.set(user_data, merge=True)
+        user_store.save(uid, user_data)
         return True
     except Exception as e:
         st.error(f"Failed to save user data: {e}")
         return False
-
-
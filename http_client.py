@@ -0,0 +1,233 @@
+"""
+Shared HTTP Client for Tech News App
+"""
+import os
+import random
+import threading
+import time
+from functools import partial
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import CircuitBreaker, OPEN, DEFAULT_KIND, DEFAULT_FAILURE_THRESHOLD, DEFAULT_SLOW_THRESHOLD, DEFAULT_COOLDOWN
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF = 0.5  # Base delay in seconds, doubled on every retry
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the host's circuit is open"""
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    """Keep-alive session with per-host connection pools, retries, jittered backoff,
+    circuit breakers and latency-based read timeouts"""
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF, pool_size=DEFAULT_POOL_SIZE, breaker_factory=CircuitBreaker):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        # urllib3 keeps one pool per (scheme, host, port); retries are handled here instead
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._breaker_factory = breaker_factory
+        self._breakers = {}
+
+    def breaker(self, host):
+        """The circuit breaker of a host, created on first use"""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = self._breaker_factory()
+            return breaker
+
+    def _timeout(self, timeout, breaker=None, kind=DEFAULT_KIND):
+        """Turn a single read timeout into a (connect, read) pair, shortened to the host's observed latency"""
+        if timeout is None:
+            connect, read = self.connect_timeout, self.read_timeout
+        elif isinstance(timeout, (int, float)):
+            connect, read = min(self.connect_timeout, timeout), timeout
+        else:
+            connect, read = timeout
+        if breaker is not None:
+            read = breaker.timeout(read, kind)
+        return (connect, read)
+
+    def _delay(self, attempt, response=None):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def _count(self, host, key):
+        with self._lock:
+            counters = self._counters.setdefault(host, {"requests": 0, "retries": 0, "errors": 0, "short_circuited": 0})
+            counters[key] += 1
+
+    def request(self, method, url, timeout=None, retries=None, kind=DEFAULT_KIND, **kwargs):
+        """Send a request, retrying connection errors and retryable statuses.
+
+        The last response is returned even if its status is retryable, so
+        callers keep their own status handling. The last exception is
+        re-raised once retries are exhausted. While the host's circuit is
+        open, CircuitOpenError (a ConnectionError) is raised without
+        sending anything.
+
+        kind names the request's latency profile, e.g. "stream" or "batch",
+        so its latencies do not skew the adaptive timeout of other requests.
+        """
+        host = urlsplit(url).hostname or ""
+        retries = self.max_retries if retries is None else retries
+        breaker = self.breaker(host)
+
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                self._count(host, "short_circuited")
+                raise CircuitOpenError(f"{host} is unavailable; retrying in {breaker.retry_in():.0f}s")
+            self._count(host, "requests")
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=self._timeout(timeout, breaker, kind), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                breaker.record_failure()
+                self._count(host, "errors")
+                if attempt == retries:
+                    raise
+                self._count(host, "retries")
+                time.sleep(self._delay(attempt))
+                continue
+            except requests.exceptions.RequestException:
+                # Not retryable, but a half-open probe must still report back
+                breaker.record_failure()
+                self._count(host, "errors")
+                raise
+
+            # 4xx answers (429 included) mean the host is up; only 5xx count against it
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success(time.monotonic() - started, kind)
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            self._count(host, "retries")
+            delay = self._delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Return per-host request counters and connections opened vs. reused"""
+        with self._lock:
+            result = {host: dict(counters) for host, counters in self._counters.items()}
+
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host_stats = result.setdefault(pool.host, {"requests": 0, "retries": 0, "errors": 0})
+            opened = host_stats.get("connections_opened", 0) + pool.num_connections
+            served = host_stats.get("_pool_requests", 0) + pool.num_requests
+            host_stats["connections_opened"] = opened
+            host_stats["_pool_requests"] = served
+            host_stats["connections_reused"] = max(0, served - opened)
+
+        for host_stats in result.values():
+            host_stats.pop("_pool_requests", None)
+            host_stats.setdefault("connections_opened", 0)
+            host_stats.setdefault("connections_reused", 0)
+        with self._lock:
+            breakers = dict(self._breakers)
+        for host, breaker in breakers.items():
+            result.setdefault(host, {})["circuit"] = breaker.stats()
+        return result
+
+    def circuit_open(self, url):
+        """Whether requests to url's host are currently being short-circuited"""
+        return self.breaker(urlsplit(url).hostname or "").state == OPEN
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide HTTP client, configured from the environment"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(
+                    connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+                    read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+                    max_retries=int(os.getenv("HTTP_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                    backoff=float(os.getenv("HTTP_BACKOFF", DEFAULT_BACKOFF)),
+                    pool_size=int(os.getenv("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                    breaker_factory=partial(
+                        CircuitBreaker,
+                        failure_threshold=int(os.getenv("HTTP_BREAKER_FAILURES", DEFAULT_FAILURE_THRESHOLD)),
+                        slow_threshold=float(os.getenv("HTTP_BREAKER_SLOW_SECONDS", DEFAULT_SLOW_THRESHOLD)),
+                        cooldown=float(os.getenv("HTTP_BREAKER_COOLDOWN", DEFAULT_COOLDOWN)),
+                    ),
+                )
+    return _client
+
+
+def get(url, **kwargs):
+    """GET through the shared client"""
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST through the shared client"""
+    return get_client().post(url, **kwargs)
+
+
+def host_stats():
+    """Per-host stats of the shared client"""
+    return get_client().stats()
+
+
+def circuit_open(url):
+    """Whether the shared client is short-circuiting requests to url's host"""
+    return get_client().circuit_open(url)
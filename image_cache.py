@@ -0,0 +1,261 @@
+"""
+Image Thumbnail Cache for Tech News App
+
+Article hero images are downloaded once, resized to the feed's display
+width, re-encoded as WebP and kept in a size-bounded LRU directory under
+static/, which Streamlit serves at app/static. Readers' browsers then load
+small local thumbnails instead of full-size images from publishers' hosts.
+"""
+import hashlib
+import io
+import ipaddress
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+
+from PIL import Image, ImageOps
+
+import http_client
+
+DEFAULT_IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "thumbs")
+DEFAULT_URL_PREFIX = "app/static/thumbs"
+DEFAULT_WIDTH = 800  # Widest a card image is displayed
+DEFAULT_QUALITY = 80
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_MAX_DOWNLOAD = 10 * 1024 * 1024  # Larger source images are skipped
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 10
+DEFAULT_FAILURE_TTL = 3600  # Seconds before a failed image is tried again
+THUMBNAIL_FORMAT = "webp"
+MAX_REDIRECTS = 5
+ALLOWED_SCHEMES = ("http", "https")
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+
+def check_public_url(url):
+    """Raise ValueError unless url is http(s) on a host that resolves only to public addresses.
+
+    Image URLs come from third-party feeds, so without this the server
+    could be made to fetch from itself or its private network.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ALLOWED_SCHEMES or not parts.hostname:
+        raise ValueError(f"Unsupported image URL: {url}")
+    try:
+        addresses = socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80),
+                                       proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError) as e:
+        raise ValueError(f"Cannot resolve {parts.hostname}") from e
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+        if not address.is_global:
+            raise ValueError(f"{parts.hostname} resolves to non-public address {address}")
+
+
+class ImageCache:
+    """Download, thumbnail and serve article images from an LRU disk cache.
+
+    Recency is the file's modification time, so the ingestion worker and
+    the app can share one directory; hits refresh it and eviction removes
+    the least recently used files once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_IMAGE_DIR, url_prefix=DEFAULT_URL_PREFIX, width=DEFAULT_WIDTH,
+                 quality=DEFAULT_QUALITY, max_bytes=DEFAULT_MAX_BYTES, max_download=DEFAULT_MAX_DOWNLOAD,
+                 concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, failure_ttl=DEFAULT_FAILURE_TTL):
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.width = width
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.max_download = max_download
+        self.timeout = timeout
+        self.failure_ttl = failure_ttl
+        os.makedirs(directory, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="image-fetch")
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._failed = {}
+        self._total_bytes = None
+        self._counters = {"hits": 0, "misses": 0, "fetched": 0, "failed": 0, "evicted": 0}
+
+    def _filename(self, url):
+        digest = hashlib.sha1(f"{url}\n{self.width}".encode("utf-8")).hexdigest()[:20]
+        return f"{digest}.{THUMBNAIL_FORMAT}"
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._counters[key] += n
+
+    def _lookup(self, url):
+        """Served URL of a cached thumbnail, marking it recently used, or None"""
+        path = os.path.join(self.directory, self._filename(url))
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return f"{self.url_prefix}/{self._filename(url)}"
+
+    def _recently_failed(self, url):
+        with self._lock:
+            failed_at = self._failed.get(url)
+        return failed_at is not None and time.monotonic() - failed_at < self.failure_ttl
+
+    def thumbnail_url(self, url):
+        """Served URL of the thumbnail for url, or "" when there is none yet.
+
+        Misses are fetched in the background so a later rerun can show them.
+        """
+        if not url:
+            return ""
+        served = self._lookup(url)
+        if served:
+            self._count("hits")
+            return served
+        self._count("misses")
+        self._schedule(url)
+        return ""
+
+    def warm(self, urls):
+        """Fetch uncached thumbnails in the background, e.g. for the next feed page"""
+        for url in urls:
+            if url and not self._lookup(url):
+                self._schedule(url)
+
+    def _schedule(self, url):
+        if self._recently_failed(url):
+            return
+        with self._lock:
+            if url in self._in_flight:
+                return
+            self._in_flight.add(url)
+        self._executor.submit(self._fetch_in_background, url)
+
+    def _fetch_in_background(self, url):
+        try:
+            self.fetch(url)
+        finally:
+            with self._lock:
+                self._in_flight.discard(url)
+
+    def fetch(self, url):
+        """Download and thumbnail url unless it is cached. Returns the served URL, or "" on failure."""
+        served = self._lookup(url)
+        if served:
+            return served
+        if self._recently_failed(url):
+            return ""
+        try:
+            data = self._download(url)
+            size = self._store(url, self._thumbnail(data))
+        except Exception:
+            with self._lock:
+                self._failed[url] = time.monotonic()
+            self._count("failed")
+            return ""
+        self._count("fetched")
+        self._account(size)
+        return f"{self.url_prefix}/{self._filename(url)}"
+
+    def prefetch(self, urls):
+        """Fetch thumbnails for urls concurrently; used at ingest. Returns {url: served URL or ""}."""
+        urls = list(dict.fromkeys(u for u in urls if u))
+        return dict(zip(urls, self._executor.map(self.fetch, urls)))
+
+    def _get(self, url):
+        """GET url, following redirects only to public http(s) hosts"""
+        for _ in range(MAX_REDIRECTS + 1):
+            check_public_url(url)
+            response = http_client.get(url, timeout=self.timeout, retries=0, stream=True, allow_redirects=False)
+            if response.status_code not in REDIRECT_STATUSES or "Location" not in response.headers:
+                return response
+            url = urljoin(url, response.headers["Location"])
+            response.close()
+        raise ValueError("Too many redirects")
+
+    def _download(self, url):
+        response = self._get(url)
+        try:
+            response.raise_for_status()
+            if not response.headers.get("Content-Type", "image/").startswith("image/"):
+                raise ValueError("Not an image")
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data.extend(chunk)
+                if len(data) > self.max_download:
+                    raise ValueError("Image too large")
+            return bytes(data)
+        finally:
+            response.close()
+
+    def _thumbnail(self, data):
+        """Resize to at most self.width pixels wide and encode as WebP"""
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.width > self.width:
+                height = max(1, round(image.height * self.width / image.width))
+                image = image.resize((self.width, height), Image.LANCZOS)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            out = io.BytesIO()
+            image.save(out, THUMBNAIL_FORMAT, quality=self.quality, method=4)
+            return out.getvalue()
+
+    def _store(self, url, data):
+        path = os.path.join(self.directory, self._filename(url))
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def _account(self, size):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._files())
+            else:
+                self._total_bytes += size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def _files(self):
+        """(path, size, mtime) of every cached thumbnail"""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(f".{THUMBNAIL_FORMAT}"):
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def evict(self):
+        """Remove least recently used thumbnails until the cache is 90% of max_bytes. Returns the number removed."""
+        files = sorted(self._files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        removed = 0
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._total_bytes = total
+        self._count("evicted", removed)
+        return removed
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else None
+        return stats
@@ -0,0 +1,179 @@
+"""
+Background Ingestion Worker for Tech News App
+
+Periodically pulls NewsAPI, summarizes new articles and writes a
+ready-to-render digest that app.py reads instead of doing the work itself.
+
+Run with: python ingest_worker.py [--once]
+"""
+import argparse
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+
+import http_client
+from dedup import dedupe_articles
+from digest_store import read_digest, write_digest, DEFAULT_DIGEST_PATH
+from news_client import NewsIngestor, queries_from_env, DEFAULT_PAGE_SIZE, DEFAULT_MAX_PAGES, DEFAULT_STATE_PATH
+from summarizer import SummarizationEngine, DEFAULT_MAX_WORKERS, DEFAULT_RATE, DEFAULT_BURST, DEFAULT_BATCH_SIZE
+from summary_scheduler import budget_from_env, PRIORITY_BACKLOG
+from summary_cache import SummaryCache, DEFAULT_TTL, DEFAULT_MAX_ENTRIES
+from image_cache import ImageCache, DEFAULT_IMAGE_DIR, DEFAULT_MAX_BYTES, DEFAULT_CONCURRENCY
+import article_archive
+from search_index import SearchIndex, DEFAULT_INDEX_PATH
+
+DEFAULT_INTERVAL = 600  # Seconds between ingestion runs
+DIGEST_SIZE = 200
+SUMMARIZE_AHEAD = 30  # Newest articles summarized up front; the app summarizes the rest when paged to
+
+logger = logging.getLogger("ingest_worker")
+
+
+def build_engine():
+    """Create the summarization engine from the same settings app.py uses"""
+    cache = SummaryCache(
+        ttl=int(os.getenv("SUMMARY_CACHE_TTL", DEFAULT_TTL)),
+        max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+    )
+    return SummarizationEngine(
+        os.getenv("OPENROUTER_API_KEY"),
+        cache=cache,
+        max_workers=int(os.getenv("SUMMARY_MAX_WORKERS", DEFAULT_MAX_WORKERS)),
+        rate=float(os.getenv("OPENROUTER_RATE_LIMIT", DEFAULT_RATE)),
+        burst=int(os.getenv("OPENROUTER_BURST", DEFAULT_BURST)),
+        batch_size=int(os.getenv("SUMMARY_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        budget=budget_from_env(),
+    )
+
+
+def build_ingestor():
+    """Create the NewsAPI ingestor from NEWS_* settings"""
+    return NewsIngestor(
+        os.getenv("NEWS_API_KEY"),
+        queries_from_env(),
+        page_size=int(os.getenv("NEWS_PAGE_SIZE", DEFAULT_PAGE_SIZE)),
+        max_pages=int(os.getenv("NEWS_MAX_PAGES", DEFAULT_MAX_PAGES)),
+        state_path=os.getenv("INGEST_STATE_PATH", DEFAULT_STATE_PATH),
+    )
+
+
+def build_image_cache():
+    """Create the thumbnail cache the app serves images from"""
+    return ImageCache(
+        directory=os.getenv("IMAGE_CACHE_DIR", DEFAULT_IMAGE_DIR),
+        max_bytes=int(os.getenv("IMAGE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        concurrency=int(os.getenv("IMAGE_FETCH_CONCURRENCY", DEFAULT_CONCURRENCY)),
+    )
+
+
+def build_archive():
+    """Create the article archive from ARCHIVE_* settings"""
+    return article_archive.ArticleArchive(
+        directory=os.getenv("ARCHIVE_DIR", article_archive.DEFAULT_ARCHIVE_DIR),
+        segment_bytes=int(os.getenv("ARCHIVE_SEGMENT_BYTES", article_archive.DEFAULT_SEGMENT_BYTES)),
+        max_age=int(os.getenv("ARCHIVE_MAX_AGE_DAYS", article_archive.DEFAULT_MAX_AGE // 86400)) * 86400,
+        max_bytes=int(os.getenv("ARCHIVE_MAX_BYTES", article_archive.DEFAULT_MAX_BYTES)),
+    )
+
+
+def build_search_index():
+    """Load the full-text search index the app queries"""
+    return SearchIndex(os.getenv("SEARCH_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+
+def ingest_once(engine, ingestor, digest_path, digest_size=DIGEST_SIZE, image_cache=None,
+                summarize_ahead=SUMMARIZE_AHEAD, archive=None, search_index=None):
+    """Fetch new articles, summarize them and publish the digest. Returns the number of new articles."""
+    new_articles, errors, poll_state = ingestor.poll()
+    for error in errors:
+        logger.warning("NewsAPI fetch failed: %s", error)
+
+    previous = read_digest(digest_path, max_age=0)
+    known = previous["articles"] if previous else []
+    if not new_articles and not known:
+        # Keep any previous digest rather than publishing an empty one
+        ingestor.commit(poll_state)
+        return 0
+
+    # Only new articles and earlier failures are sent to the summarizer
+    new_ids = {a.id for a in new_articles}
+    pool = new_articles + [a for a in known if a.id not in new_ids]
+    pool.sort(key=lambda a: a.published_iso, reverse=True)
+    # Collapse the same story from several outlets before paying to summarize it
+    pool = dedupe_articles(pool)[:digest_size]
+
+    to_summarize = [a for a in pool[:summarize_ahead] if not a.summary]
+    # Nobody is waiting on the worker, so it only spends the backlog share of the budget
+    results = engine.summarize_many(to_summarize, PRIORITY_BACKLOG)
+    # Older articles pick up summaries the app has cached for them since the last run
+    summaries = {
+        a.id: engine.cached_summary(a.title, a.description)
+        for a in pool[summarize_ahead:] if not a.summary
+    }
+    for article, result in zip(to_summarize, results):
+        if result.warning:
+            logger.warning("%s: %s", article.title, result.warning)
+        # Failed summaries are left out so they are retried next run
+        summaries[article.id] = result.summary if result.ok else None
+
+    digest_articles = [
+        article.with_summary(summaries[article.id]) if article.id in summaries else article
+        for article in pool
+    ]
+    if image_cache is not None:
+        # Thumbnails are ready before the digest that references them is published
+        thumbnails = image_cache.prefetch(a.image_url for a in digest_articles)
+        logger.info("Thumbnails: %d of %d ready, %s", sum(1 for src in thumbnails.values() if src),
+                    len(thumbnails), image_cache.stats())
+    write_digest(digest_articles, digest_path)
+    if archive is not None:
+        # Only new articles and newly summarized ones are actually appended
+        logger.info("Archived %d articles, %s", archive.append(digest_articles), archive.stats())
+    if search_index is not None:
+        logger.info("Indexed %d articles for search (%d total)", search_index.update(digest_articles), len(search_index))
+    # Marks move only now, so articles of a failed run are fetched again next time
+    ingestor.commit(poll_state)
+    logger.info("Wrote digest with %d articles (%d new, %d summarized) to %s",
+                len(digest_articles), len(new_articles), len(to_summarize), digest_path)
+    logger.info("Summaries: %s", engine.stats())
+    for host, stats in http_client.host_stats().items():
+        logger.info("HTTP %s: %s", host, stats)
+    return len(new_articles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tech Daily background ingestion worker")
+    parser.add_argument("--once", action="store_true", help="run a single ingestion pass and exit")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    interval = int(os.getenv("INGEST_INTERVAL", DEFAULT_INTERVAL))
+    digest_path = os.getenv("DIGEST_PATH", DEFAULT_DIGEST_PATH)
+    digest_size = int(os.getenv("DIGEST_SIZE", DIGEST_SIZE))
+    summarize_ahead = int(os.getenv("DIGEST_SUMMARIZE_AHEAD", SUMMARIZE_AHEAD))
+    engine = build_engine()
+    ingestor = build_ingestor()
+    image_cache = build_image_cache()
+    archive = build_archive()
+    search_index = build_search_index()
+    # Search results must resolve in the archive, so articles retention drops leave the index too
+    archive.start_compactor(int(os.getenv("ARCHIVE_COMPACT_INTERVAL", article_archive.DEFAULT_COMPACT_INTERVAL)),
+                            on_removed=search_index.remove)
+
+    while True:
+        started = time.monotonic()
+        try:
+            ingest_once(engine, ingestor, digest_path, digest_size, image_cache, summarize_ahead, archive, search_index)
+        except Exception:
+            logger.exception("Ingestion run failed")
+        if args.once:
+            break
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    main()
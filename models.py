@@ -0,0 +1,103 @@
+"""
+Article Model for Tech News App
+"""
+import hashlib
+import sys
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def parse_published_at(value):
+    """Parse a NewsAPI publishedAt timestamp, or return None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+
+
+def article_id(url, title, source):
+    """Stable content hash ID: the URL when there is one, otherwise title and source"""
+    material = url or f"{title}\n{source}"
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _intern(value):
+    # Thousands of articles share a few dozen source names
+    return sys.intern(value) if value else ""
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """Normalized news article, built once at ingest and shared by caches, dedup and rendering"""
+
+    id: str
+    title: str
+    description: str
+    url: str
+    image_url: str
+    source: str
+    author: str
+    published_at: Optional[datetime]
+    summary: Optional[str] = None
+    # (source name, url) pairs of other outlets carrying the same story
+    also_reported_by: Tuple[Tuple[str, str], ...] = field(default=())
+
+    @classmethod
+    def from_newsapi(cls, data):
+        """Build an Article from a raw NewsAPI article dict"""
+        title = data.get("title") or "No Title"
+        url = data.get("url") or ""
+        source = _intern((data.get("source") or {}).get("name") or "Unknown")
+        return cls(
+            id=article_id(url, title, source),
+            title=title,
+            description=data.get("description") or "",
+            url=url,
+            image_url=data.get("urlToImage") or "",
+            source=source,
+            author=_intern(data.get("author") or ""),
+            published_at=parse_published_at(data.get("publishedAt")),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an Article stored with to_dict()"""
+        published_at = data.get("published_at")
+        return cls(
+            id=data["id"],
+            title=data.get("title") or "No Title",
+            description=data.get("description") or "",
+            url=data.get("url") or "",
+            image_url=data.get("image_url") or "",
+            source=_intern(data.get("source") or "Unknown"),
+            author=_intern(data.get("author") or ""),
+            published_at=datetime.fromisoformat(published_at) if published_at else None,
+            summary=data.get("summary"),
+            also_reported_by=tuple(tuple(pair) for pair in data.get("also_reported_by") or ()),
+        )
+
+    def to_dict(self):
+        """JSON-serializable form, the inverse of from_dict()"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "image_url": self.image_url,
+            "source": self.source,
+            "author": self.author,
+            "published_at": self.published_at.isoformat() if self.published_at else None,
+            "summary": self.summary,
+            "also_reported_by": [list(pair) for pair in self.also_reported_by],
+        }
+
+    @property
+    def published_iso(self):
+        """publishedAt as an ISO string for ordering and high-water marks ("" if unknown)"""
+        return self.published_at.isoformat() if self.published_at else ""
+
+    def with_summary(self, summary):
+        return replace(self, summary=summary)
@@ -0,0 +1,218 @@
+"""
+NewsAPI Client for Tech News App
+"""
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import http_client
+from models import Article
+
+TOP_HEADLINES_URL = "https://newsapi.org/v2/top-headlines"
+EVERYTHING_URL = "https://newsapi.org/v2/everything"
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGES = 2
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_STATE_PATH = os.path.join(".cache", "ingest_state.json")
+MAX_SEEN_URLS = 2000  # URLs remembered per unsorted query
+
+
+def _get_articles(url, params, timeout=10):
+    """Request one NewsAPI page. Returns (articles, total_results, error_message)."""
+    try:
+        response = http_client.get(url, params=params, timeout=timeout)
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("status") == "ok":
+                return data.get("articles", []), data.get("totalResults", 0), None
+            else:
+                return [], 0, f"NewsAPI error: {data.get('message', 'Unknown error')}"
+        elif response.status_code == 401:
+            return [], 0, "❌ Invalid NewsAPI key. Please check your API key."
+        elif response.status_code == 429:
+            return [], 0, "⏰ API rate limit exceeded. Please try again later."
+        else:
+            return [], 0, f"Failed to fetch news. Status code: {response.status_code}"
+    except http_client.CircuitOpenError:
+        return [], 0, "🔌 NewsAPI is temporarily unavailable. Please try again shortly."
+    except requests.exceptions.Timeout:
+        return [], 0, "⏱️ Request timed out. Please check your internet connection."
+    except requests.exceptions.ConnectionError:
+        return [], 0, "🌐 Connection error. Please check your internet connection."
+    except Exception as e:
+        return [], 0, f"❌ Unexpected error: {str(e)}"
+
+
+def fetch_top_headlines(api_key, category="technology", language="en", timeout=10, page_size=None):
+    """Fetch top headlines from NewsAPI.
+
+    Returns (articles, error_message); error_message is None on success.
+    """
+    if not api_key:
+        return [], "⚠️ NEWS_API_KEY not found. Please add it to your .env file."
+
+    params = {"category": category, "language": language, "apiKey": api_key}
+    if page_size:
+        params["pageSize"] = page_size
+    articles, _, error = _get_articles(TOP_HEADLINES_URL, params, timeout=timeout)
+    return articles, error
+
+
+def queries_from_env():
+    """Build ingestion queries from NEWS_CATEGORIES and NEWS_QUERIES (comma-separated)"""
+    categories = [c.strip() for c in os.getenv("NEWS_CATEGORIES", "technology").split(",") if c.strip()]
+    searches = [q.strip() for q in os.getenv("NEWS_QUERIES", "").split(",") if q.strip()]
+    return [{"category": c} for c in categories] + [{"q": q} for q in searches]
+
+
+def query_key(query):
+    """Stable name of a query, used for its high-water mark"""
+    return "&".join(f"{k}={v}" for k, v in sorted(query.items()))
+
+
+class NewsIngestor:
+    """Poll several NewsAPI queries concurrently and return only articles not seen before.
+
+    Queries sorted by publishedAt (keyword queries) keep a high-water mark
+    on publishedAt. top-headlines is not sorted by time, so a story can
+    become a headline after newer ones; those queries remember the URLs
+    they have returned instead. Paging stops as soon as a page reaches
+    known articles, so steady-state polls cost one request per query.
+
+    poll() does not move the marks: pass the state it returns to commit()
+    once the new articles are safely stored, so a failed run fetches them again.
+    """
+
+    def __init__(self, api_key, queries, language="en", page_size=DEFAULT_PAGE_SIZE,
+                 max_pages=DEFAULT_MAX_PAGES, max_workers=DEFAULT_MAX_WORKERS, state_path=DEFAULT_STATE_PATH):
+        self.api_key = api_key
+        self.queries = queries
+        self.language = language
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_workers = max_workers
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        directory = os.path.dirname(self.state_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ingest-state-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _sorted_by_time(query):
+        return "q" in query
+
+    def _request(self, query, page, since):
+        params = {"language": self.language, "pageSize": self.page_size, "page": page, "apiKey": self.api_key}
+        params.update(query)
+        if self._sorted_by_time(query):
+            params["sortBy"] = "publishedAt"
+            if since:
+                params["from"] = since
+            return _get_articles(EVERYTHING_URL, params)
+        return _get_articles(TOP_HEADLINES_URL, params)
+
+    def _poll_query(self, query):
+        """Fetch pages of one query until known articles are reached. Returns (new_articles, error, state)."""
+        key = query_key(query)
+        with self._lock:
+            state = dict(self._state.get(key, {}))
+        sorted_by_time = self._sorted_by_time(query)
+        high_water = state.get("high_water", "")
+        seen_at_mark = set(state.get("seen_at_mark", []))
+        seen_urls = list(state.get("seen_urls", []))
+        known_urls = set(seen_urls)
+
+        new_articles, returned = [], []
+        for page in range(1, self.max_pages + 1):
+            articles, total, error = self._request(query, page, high_water if sorted_by_time else None)
+            if error:
+                # Keep what earlier pages produced; the state only moves past those
+                if not new_articles:
+                    return [], error, None
+                break
+
+            reached_known = False
+            found_before = len(new_articles)
+            for article in articles:
+                url = article.get("url") or article.get("title") or ""
+                returned.append(url)
+                if sorted_by_time:
+                    published = article.get("publishedAt") or ""
+                    is_new = published > high_water or (published == high_water and url not in seen_at_mark)
+                else:
+                    is_new = url not in known_urls
+                if is_new:
+                    new_articles.append(article)
+                else:
+                    reached_known = True
+
+            if not sorted_by_time:
+                # Known headlines are interleaved with new ones; only a page with nothing new ends the scan
+                reached_known = len(new_articles) == found_before
+            if reached_known or len(articles) < self.page_size or page * self.page_size >= total:
+                break
+
+        if sorted_by_time:
+            if new_articles:
+                newest = max(a.get("publishedAt") or "" for a in new_articles)
+                if newest > high_water:
+                    seen_at_mark = set()
+                    high_water = newest
+                seen_at_mark.update(a.get("url") for a in new_articles
+                                    if (a.get("publishedAt") or "") == high_water)
+            state = {"high_water": high_water, "seen_at_mark": sorted(u for u in seen_at_mark if u)}
+        else:
+            # Most recently returned last, so the oldest URLs are the ones forgotten
+            returned_set = set(returned)
+            seen_urls = [u for u in seen_urls if u not in returned_set] + list(dict.fromkeys(u for u in returned if u))
+            state = {"seen_urls": seen_urls[-MAX_SEEN_URLS:]}
+        return new_articles, None, state
+
+    def poll(self):
+        """Poll every query concurrently.
+
+        Returns (new Articles deduplicated by article ID, errors, state); pass
+        state to commit() once the articles are stored.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(self._poll_query, self.queries))
+
+        new_articles, errors, ids, state = [], [], set(), {}
+        for query, (articles, error, query_state) in zip(self.queries, results):
+            if error:
+                errors.append(f"{query_key(query)}: {error}")
+            if query_state is not None:
+                state[query_key(query)] = query_state
+            for data in articles:
+                article = Article.from_newsapi(data)
+                if article.id in ids:
+                    continue
+                ids.add(article.id)
+                new_articles.append(article)
+
+        new_articles.sort(key=lambda a: a.published_iso, reverse=True)
+        return new_articles, errors, state
+
+    def commit(self, state):
+        """Persist the marks returned by poll(), after the articles it returned are stored"""
+        with self._lock:
+            self._state.update(state)
+            self._save_state()
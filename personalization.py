@@ -0,0 +1,188 @@
+"""
+Personalized Feed Ranking for Tech News App
+
+Articles are turned into hashed sparse feature vectors: words of the title
+and description, plus the source. Each user has an interest vector learned
+from the articles they open. Scoring a candidate list is one gather and one
+bincount over the concatenated features, so thousands of articles rank in
+milliseconds. Only the strongest dimensions of the interest vector are
+kept, which keeps it small enough for the user's Firestore document.
+"""
+import base64
+import binascii
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from search_index import tokenize
+
+FEATURE_BITS = 18
+DIMENSIONS = 1 << FEATURE_BITS
+MAX_INTERESTS = 256  # Dimensions kept in the stored profile
+DECAY = 0.95  # Existing interests fade a little with every click, so tastes can drift
+PERSONAL_WEIGHT = 1.0  # Interest match relative to the recency prior
+RECENCY_HALF_LIFE = 12 * 3600
+TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.5
+SOURCE_WEIGHT = 0.5
+PROFILE_VERSION = 1
+CANDIDATE_CACHE_SIZE = 8  # Candidate lists whose feature matrices are kept
+
+_candidates = OrderedDict()
+_candidates_lock = threading.Lock()
+
+
+def _hash(token):
+    """Feature dimension and sign of a token; signs make hash collisions cancel out on average"""
+    h = zlib.crc32(token.encode("utf-8"))
+    return h & (DIMENSIONS - 1), 1.0 if h & DIMENSIONS else -1.0
+
+
+@lru_cache(maxsize=20000)
+def _features(title, description, source):
+    """L2-normalized (dimensions, values) of one article"""
+    weights = {}
+    tokens = [(t, TITLE_WEIGHT) for t in tokenize(title)] + [(t, DESCRIPTION_WEIGHT) for t in tokenize(description)]
+    if source:
+        tokens.append((f"source:{source.strip().lower()}", SOURCE_WEIGHT))
+    for token, weight in tokens:
+        dim, sign = _hash(token)
+        weights[dim] = weights.get(dim, 0.0) + sign * weight
+    indices = np.fromiter(weights.keys(), dtype=np.int64, count=len(weights))
+    values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+    norm = np.linalg.norm(values)
+    if norm:
+        values /= norm
+    return indices, values
+
+
+def article_features(article):
+    return _features(article.title or "", article.description or "", article.source or "")
+
+
+def featurize(articles):
+    """Sparse feature matrix of articles in coordinate form: (rows, vocabulary, columns, values, row count).
+
+    Entry i is at row rows[i] and dimension vocabulary[columns[i]]; the
+    distinct dimensions are kept apart so scoring looks each one up once.
+    """
+    features = [article_features(article) for article in articles]
+    if not features:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, np.zeros(0, dtype=np.float32), 0
+    rows = np.repeat(np.arange(len(features)), [len(indices) for indices, _ in features])
+    vocabulary, columns = np.unique(np.concatenate([f[0] for f in features]), return_inverse=True)
+    return rows, vocabulary, columns, np.concatenate([f[1] for f in features]), len(features)
+
+
+def _published(articles):
+    """Publish times in epoch seconds; undated articles count as the oldest dated one"""
+    published = np.array([a.published_at.timestamp() if a.published_at else np.nan for a in articles])
+    if np.isnan(published).all():
+        return np.zeros(len(articles))
+    return np.nan_to_num(published, nan=np.nanmin(published))
+
+
+def candidate_matrix(articles):
+    """(features, publish times) of a candidate list, cached because the feed repeats across reruns"""
+    key = tuple(article.id for article in articles)
+    with _candidates_lock:
+        cached = _candidates.get(key)
+        if cached is not None:
+            _candidates.move_to_end(key)
+            return cached
+    cached = featurize(articles), _published(articles)
+    with _candidates_lock:
+        _candidates[key] = cached
+        while len(_candidates) > CANDIDATE_CACHE_SIZE:
+            _candidates.popitem(last=False)
+    return cached
+
+
+class InterestProfile:
+    """A user's interests as sparse weights over the hashed feature space: sorted dimensions and their weights"""
+
+    def __init__(self, dims=None, weights=None, clicks=0):
+        self.clicks = clicks
+        self._dims = np.zeros(0, dtype=np.int64)
+        self._weights = np.zeros(0, dtype=np.float32)
+        if dims is not None:
+            self._set(np.asarray(dims, dtype=np.int64), np.asarray(weights, dtype=np.float32))
+
+    def _set(self, dims, weights):
+        """Keep the strongest MAX_INTERESTS non-zero weights, sorted by dimension"""
+        keep = np.flatnonzero(weights)
+        if len(keep) > MAX_INTERESTS:
+            keep = keep[np.argsort(-np.abs(weights[keep]), kind="stable")[:MAX_INTERESTS]]
+        order = keep[np.argsort(dims[keep])]
+        self._dims, self._weights = dims[order], weights[order]
+
+    @classmethod
+    def from_doc(cls, doc):
+        """Profile from the "interests" field of a user document; empty if missing or unreadable"""
+        if not doc or doc.get("version") != PROFILE_VERSION:
+            return cls()
+        try:
+            dims = np.frombuffer(base64.b64decode(doc["dims"]), dtype="<u4").astype(np.int64)
+            weights = np.frombuffer(base64.b64decode(doc["weights"]), dtype="<f2").astype(np.float32)
+            clicks = int(doc.get("clicks", 0))
+        except (KeyError, TypeError, ValueError, binascii.Error):
+            return cls()
+        if len(dims) != len(weights) or (len(dims) and dims.max() >= DIMENSIONS):
+            return cls()
+        return cls(dims, weights, clicks)
+
+    def to_doc(self):
+        """Compact form for the user document: base64 dimensions (uint32) and weights (float16)"""
+        return {
+            "version": PROFILE_VERSION,
+            "dims": base64.b64encode(self._dims.astype("<u4").tobytes()).decode("ascii"),
+            "weights": base64.b64encode(self._weights.astype("<f2").tobytes()).decode("ascii"),
+            "clicks": self.clicks,
+        }
+
+    def copy(self):
+        return InterestProfile(self._dims.copy(), self._weights.copy(), self.clicks)
+
+    @property
+    def empty(self):
+        return not len(self._dims)
+
+    def learn(self, article, weight=1.0):
+        """Move the interests towards an article the user opened"""
+        indices, values = article_features(article)
+        dims = np.union1d(self._dims, indices)
+        weights = np.zeros(len(dims), dtype=np.float32)
+        weights[np.searchsorted(dims, self._dims)] = self._weights * DECAY
+        weights[np.searchsorted(dims, indices)] += weight * values
+        self._set(dims, weights)
+        self.clicks += 1
+
+    def scores(self, features):
+        """Cosine similarity of each row of a featurize() matrix to the interests"""
+        rows, vocabulary, columns, values, count = features
+        norm = np.linalg.norm(self._weights)
+        if not norm or not count:
+            return np.zeros(count)
+        # Look each distinct feature dimension up in the sorted interest dimensions
+        positions = np.minimum(np.searchsorted(self._dims, vocabulary), len(self._dims) - 1)
+        lookup = np.where(self._dims[positions] == vocabulary, self._weights[positions], 0.0)
+        return np.bincount(rows, weights=lookup[columns] * values, minlength=count) / norm
+
+
+def rank(articles, profile, now=None, personal_weight=PERSONAL_WEIGHT, half_life=RECENCY_HALF_LIFE):
+    """Articles ordered by interest match plus a recency prior; unchanged for an empty profile"""
+    articles = list(articles)
+    if profile.empty or len(articles) < 2:
+        return articles
+    features, published = candidate_matrix(articles)
+    affinity = profile.scores(features)
+    ages = np.maximum((now or time.time()) - published, 0.0)
+    recency = 0.5 ** (ages / half_life)
+
+    order = np.argsort(-(personal_weight * affinity + recency), kind="stable")
+    return [articles[i] for i in order.tolist()]
@@ -0,0 +1,138 @@
+"""
+Per-User Read State for Tech News App
+
+A rolling Bloom filter of the article ids a user has seen. New ids go into
+the newest of a few generations. When the newest generation holds its
+capacity, the oldest is dropped, so the filter stays a fixed size and
+forgets articles long gone from the feed. Membership of a whole feed is
+checked in one NumPy pass. The filter is stored in the user's Firestore
+document, so no per-article reads are needed.
+"""
+import base64
+import binascii
+import math
+
+import numpy as np
+
+DEFAULT_CAPACITY = 2000  # Articles per generation
+DEFAULT_GENERATIONS = 3
+DEFAULT_ERROR_RATE = 0.01
+FILTER_VERSION = 1
+
+
+def _bloom_size(capacity, error_rate):
+    """Bits and hash count of a Bloom filter holding capacity items at error_rate"""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return (bits + 7) // 8 * 8, hashes
+
+
+class SeenFilter:
+    """Rolling Bloom filter over 64-bit hex article ids"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, generations=DEFAULT_GENERATIONS, error_rate=DEFAULT_ERROR_RATE):
+        self.capacity = capacity
+        self.bits, self.hashes = _bloom_size(capacity, error_rate)
+        self.error_rate = error_rate
+        # Oldest first; each is (bit array, items added)
+        self._generations = [[np.zeros(self.bits // 8, dtype=np.uint8), 0] for _ in range(generations)]
+
+    def _positions(self, article_ids):
+        """Bit positions of each id, shape (ids, hashes), by double hashing the id's two halves"""
+        ids = np.array([int(article_id, 16) for article_id in article_ids], dtype=np.uint64)
+        high = ids >> np.uint64(32)
+        low = (ids & np.uint64(0xFFFFFFFF)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return ((high[:, None] + steps[None, :] * low[:, None]) % np.uint64(self.bits)).astype(np.int64)
+
+    @staticmethod
+    def _test(bits, positions):
+        return ((bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1).all(axis=1)
+
+    def contains_many(self, article_ids):
+        """Boolean array: whether each id has (probably) been seen"""
+        article_ids = list(article_ids)
+        if not article_ids:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(article_ids)
+        seen = np.zeros(len(article_ids), dtype=bool)
+        for bits, _ in self._generations:
+            seen |= self._test(bits, positions)
+        return seen
+
+    def __contains__(self, article_id):
+        return bool(self.contains_many([article_id])[0])
+
+    def add(self, article_ids):
+        """Mark ids as seen. Returns how many were not seen before."""
+        article_ids = list(dict.fromkeys(article_ids))
+        if not article_ids:
+            return 0
+        fresh = int((~self.contains_many(article_ids)).sum())
+        # Ids only in older generations are added again, so what is still being seen is never rolled out
+        positions = self._positions(article_ids)
+        remaining = [a for a, present in zip(article_ids, self._test(self._generations[-1][0], positions)) if not present]
+        while remaining:
+            newest = self._generations[-1]
+            if newest[1] >= self.capacity:
+                # Roll: forget the oldest generation and start an empty one
+                self._generations = self._generations[1:] + [[np.zeros(self.bits // 8, dtype=np.uint8), 0]]
+                newest = self._generations[-1]
+            room = self.capacity - newest[1]
+            chunk, remaining = remaining[:room], remaining[room:]
+            positions = self._positions(chunk).ravel()
+            np.bitwise_or.at(newest[0], positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+            newest[1] += len(chunk)
+        return fresh
+
+    def __len__(self):
+        """Approximate number of ids remembered"""
+        return sum(count for _, count in self._generations)
+
+    def to_doc(self):
+        """Compact form for the user document; a few KB per generation at the defaults"""
+        return {
+            "version": FILTER_VERSION,
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "generations": [
+                {"bits": base64.b64encode(bits.tobytes()).decode("ascii"), "count": count}
+                for bits, count in self._generations
+            ],
+        }
+
+    @classmethod
+    def from_doc(cls, doc, **defaults):
+        """Filter from the "seen" field of a user document; empty if missing, unreadable or resized"""
+        seen = cls(**defaults)
+        if not doc or doc.get("version") != FILTER_VERSION:
+            return seen
+        if doc.get("capacity") != seen.capacity or doc.get("error_rate") != seen.error_rate:
+            return seen
+        try:
+            generations = [
+                [np.frombuffer(base64.b64decode(g["bits"]), dtype=np.uint8).copy(), int(g["count"])]
+                for g in doc["generations"]
+            ]
+        except (KeyError, TypeError, ValueError, binascii.Error):
+            return seen
+        if not generations or any(len(bits) != seen.bits // 8 for bits, _ in generations):
+            return seen
+        # Keep the newest generations if the configured number shrank
+        seen._generations = (seen._generations + generations)[-len(seen._generations):]
+        return seen
+
+    def copy(self):
+        duplicate = SeenFilter.__new__(SeenFilter)
+        duplicate.__dict__.update(self.__dict__)
+        duplicate._generations = [[bits.copy(), count] for bits, count in self._generations]
+        return duplicate
+
+
+def partition_seen(articles, seen):
+    """Articles not seen yet first, then seen ones, each group in its original order"""
+    articles = list(articles)
+    if not articles or not len(seen):
+        return articles
+    mask = seen.contains_many(article.id for article in articles)
+    return [a for a, s in zip(articles, mask) if not s] + [a for a, s in zip(articles, mask) if s]
@@ -0,0 +1,352 @@
+"""
+Full-Text Search Index for Tech News App
+
+An inverted index over title, description, source and AI summary, ranked
+with BM25. Postings are kept in compressed-sparse-row form: one array of
+document numbers and one of term weights, with per-term offsets. Scoring
+a query is a few NumPy gathers and one bincount. Articles added since the
+last save sit in small per-term lists until the next save merges them in,
+so updates are incremental. The index is saved to one .npz file and
+loaded at startup instead of being rebuilt.
+"""
+import fcntl
+import math
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "search.npz")
+DEFAULT_LIMIT = 20
+K1 = 1.2
+B = 0.75
+# Term counts are weighted by field, so a title match outranks one in the body
+FIELD_WEIGHTS = (("title", 3.0), ("source", 2.0), ("description", 1.0), ("summary", 1.0))
+COMPACT_RATIO = 0.2  # Share of superseded documents that triggers renumbering on save
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from has have how in into is it its of on or "
+    "than that the their this to was were what when which who will with".split()
+)
+
+
+def tokenize(text):
+    """Lowercased words without stopwords, with a light plural strip so "chips" finds "chip" """
+    tokens = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _fields(article):
+    return {"title": article.title, "source": article.source,
+            "description": article.description, "summary": article.summary}
+
+
+def _fingerprint(article):
+    return zlib.crc32("\x00".join(text or "" for text in _fields(article).values()).encode("utf-8"))
+
+
+class SearchIndex:
+    """BM25 index of articles by id. add() and search() are thread-safe; update() and remove() are process-safe."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, k1=K1, b=B):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        # Per document
+        self._ids = []
+        self._doc_of = {}
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._fingerprints = np.zeros(0, dtype=np.uint32)
+        self._summarized = np.zeros(0, dtype=bool)
+        self._live_count = 0
+        self._total_length = 0.0
+        # Postings: merged CSR arrays plus per-term lists added since
+        self._terms = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._pending = {}
+        self._pending_lengths = []
+
+    def __len__(self):
+        return self._live_count
+
+    # Building
+
+    def add(self, articles):
+        """Index new articles and re-index changed ones. Returns the number indexed.
+
+        A copy without a summary does not replace an indexed version that has
+        one, so articles fetched again stay findable by their summary.
+        """
+        added = 0
+        with self._lock:
+            for article in articles:
+                fingerprint = _fingerprint(article)
+                if self._current(article, fingerprint):
+                    continue
+                previous = self._doc_of.get(article.id)
+                if previous is not None:
+                    self._delete(previous)
+                self._append(article, fingerprint)
+                added += 1
+        return added
+
+    def _document(self, doc):
+        """(fingerprint, summarized) of a document"""
+        if doc < len(self._fingerprints):
+            return self._fingerprints[doc], self._summarized[doc]
+        return self._pending_lengths[doc - len(self._fingerprints)][1:]
+
+    def _current(self, article, fingerprint):
+        """Whether the indexed version of an article is up to date; call with self._lock held"""
+        doc = self._doc_of.get(article.id)
+        if doc is None:
+            return False
+        indexed_fingerprint, summarized = self._document(doc)
+        return indexed_fingerprint == fingerprint or (summarized and not article.summary)
+
+    def remove(self, article_ids):
+        """Drop articles from the index and save, e.g. once the archive no longer keeps them. Returns the number dropped."""
+        with self._lock, self._file_lock():
+            self.refresh()
+            removed = 0
+            for article_id in article_ids:
+                doc = self._doc_of.pop(article_id, None)
+                if doc is not None:
+                    self._delete(doc)
+                    removed += 1
+            if removed:
+                self.save()
+            return removed
+
+    def _append(self, article, fingerprint):
+        counts = {}
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(_fields(article)[field]):
+                counts[token] = counts.get(token, 0.0) + weight
+        doc = len(self._ids)
+        self._ids.append(article.id)
+        self._doc_of[article.id] = doc
+        for token, weight in counts.items():
+            docs, weights = self._pending.setdefault(token, ([], []))
+            docs.append(doc)
+            weights.append(weight)
+        length = sum(counts.values())
+        self._pending_lengths.append((length, fingerprint, bool(article.summary)))
+        self._live_count += 1
+        self._total_length += length
+
+    def _delete(self, doc):
+        """Mark a document superseded; its postings stay until the next renumbering"""
+        self._flush_documents()
+        if self._live[doc]:
+            self._live[doc] = False
+            self._live_count -= 1
+            self._total_length -= float(self._lengths[doc])
+
+    def _flush_documents(self):
+        """Move per-document data of pending articles into the arrays"""
+        if not self._pending_lengths:
+            return
+        lengths, fingerprints, summarized = zip(*self._pending_lengths)
+        self._lengths = np.concatenate([self._lengths, np.array(lengths, dtype=np.float32)])
+        self._fingerprints = np.concatenate([self._fingerprints, np.array(fingerprints, dtype=np.uint32)])
+        self._summarized = np.concatenate([self._summarized, np.array(summarized, dtype=bool)])
+        self._live = np.concatenate([self._live, np.ones(len(lengths), dtype=bool)])
+        self._pending_lengths = []
+
+    def _merge(self):
+        """Fold pending postings into the CSR arrays, dropping superseded documents if there are many"""
+        self._flush_documents()
+        postings = {term: (self._docs[self._offsets[i]:self._offsets[i + 1]],
+                           self._weights[self._offsets[i]:self._offsets[i + 1]])
+                    for term, i in self._terms.items()}
+        for term, (docs, weights) in self._pending.items():
+            base = postings.get(term)
+            docs, weights = np.array(docs, dtype=np.int32), np.array(weights, dtype=np.float32)
+            postings[term] = (docs, weights) if base is None else (
+                np.concatenate([base[0], docs]), np.concatenate([base[1], weights]))
+
+        renumber = None
+        if len(self._ids) and 1 - self._live_count / len(self._ids) > COMPACT_RATIO:
+            renumber = np.cumsum(self._live, dtype=np.int64) - 1
+            self._ids = [article_id for article_id, live in zip(self._ids, self._live) if live]
+            self._doc_of = {article_id: doc for doc, article_id in enumerate(self._ids)}
+            self._lengths = self._lengths[self._live]
+            self._fingerprints = self._fingerprints[self._live]
+            self._summarized = self._summarized[self._live]
+
+        terms = sorted(postings)
+        doc_parts, weight_parts, sizes = [], [], []
+        for term in terms:
+            docs, weights = postings[term]
+            if renumber is not None:
+                keep = self._live[docs]
+                docs, weights = renumber[docs[keep]].astype(np.int32), weights[keep]
+            doc_parts.append(docs)
+            weight_parts.append(weights)
+            sizes.append(len(docs))
+        if renumber is not None:
+            self._live = np.ones(len(self._ids), dtype=bool)
+        self._terms = {term: i for i, term in enumerate(terms)}
+        self._offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        self._docs = np.concatenate(doc_parts) if doc_parts else np.zeros(0, dtype=np.int32)
+        self._weights = np.concatenate(weight_parts) if weight_parts else np.zeros(0, dtype=np.float32)
+        self._pending = {}
+
+    # Searching
+
+    def _postings(self, term):
+        i = self._terms.get(term)
+        parts = []
+        if i is not None:
+            parts.append((self._docs[self._offsets[i]:self._offsets[i + 1]],
+                          self._weights[self._offsets[i]:self._offsets[i + 1]]))
+        pending = self._pending.get(term)
+        if pending:
+            parts.append((np.array(pending[0], dtype=np.int32), np.array(pending[1], dtype=np.float32)))
+        if not parts:
+            return None
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Best-matching article ids for query as (article_id, score) pairs, best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            if not terms or not self._live_count:
+                return []
+            self._flush_documents()
+            average_length = self._total_length / self._live_count
+
+            doc_parts, score_parts = [], []
+            for term in terms:
+                postings = self._postings(term)
+                if postings is None:
+                    continue
+                docs, weights = postings
+                live = self._live[docs]
+                docs, weights = docs[live], weights[live]
+                if not len(docs):
+                    continue
+                idf = math.log(1 + (self._live_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[docs] / average_length)
+                doc_parts.append(docs)
+                score_parts.append(idf * weights * (self.k1 + 1) / (weights + norm))
+            if not doc_parts:
+                return []
+
+            scores = np.bincount(np.concatenate(doc_parts), weights=np.concatenate(score_parts),
+                                 minlength=len(self._ids))
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            # Ties go to the most recently indexed article
+            best = candidates[np.lexsort((-candidates, -scores[candidates]))]
+            return [(self._ids[doc], float(scores[doc])) for doc in best]
+
+    # Persistence
+
+    @contextmanager
+    def _file_lock(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self):
+        """Merge pending postings and write the index atomically"""
+        with self._lock:
+            self._merge()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    ids=np.array(self._ids, dtype="S16"),
+                    lengths=self._lengths,
+                    live=self._live,
+                    fingerprints=self._fingerprints,
+                    summarized=self._summarized,
+                    terms=np.frombuffer("\n".join(self._terms).encode("utf-8"), dtype=np.uint8),
+                    offsets=self._offsets,
+                    docs=self._docs,
+                    weights=self._weights,
+                )
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.path.getmtime(self.path)
+
+    def refresh(self):
+        """Reload the index if another process saved a newer one. Returns whether it reloaded."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            if mtime == self._loaded_mtime:
+                return False
+            try:
+                with np.load(self.path) as data:
+                    self._reset()
+                    self._ids = data["ids"].astype(str).tolist()
+                    self._lengths = data["lengths"]
+                    self._live = data["live"].copy()
+                    # Superseded and removed documents are not looked up by id
+                    self._doc_of = {article_id: doc for doc, article_id in enumerate(self._ids) if self._live[doc]}
+                    self._fingerprints = data["fingerprints"]
+                    # Indexes saved before summaries were tracked count as unsummarized
+                    self._summarized = (data["summarized"].copy() if "summarized" in data.files
+                                        else np.zeros(len(self._ids), dtype=bool))
+                    terms = data["terms"].tobytes().decode("utf-8")
+                    self._terms = {term: i for i, term in enumerate(terms.split("\n"))} if terms else {}
+                    self._offsets = data["offsets"]
+                    self._docs = data["docs"]
+                    self._weights = data["weights"]
+            except (OSError, ValueError, KeyError):
+                # Unreadable or from an incompatible version; start over and rebuild as articles arrive
+                self._reset()
+                return False
+            self._live_count = int(self._live.sum())
+            self._total_length = float(self._lengths[self._live].sum())
+            self._loaded_mtime = mtime
+            return True
+
+    def update(self, articles):
+        """Add articles and save, merging with whatever other processes saved meanwhile"""
+        with self._lock:
+            # Copies already indexed are skipped without taking the file lock
+            articles = [article for article in articles if not self._current(article, _fingerprint(article))]
+        if not articles:
+            return 0
+        with self._lock, self._file_lock():
+            self.refresh()
+            added = self.add(articles)
+            if added:
+                self.save()
+            return added
@@ -0,0 +1,309 @@
+"""
+Shared Cross-Process Cache for Tech News App
+
+Every web worker and the ingestion worker on a host share one SQLite
+database in WAL mode, where readers never block the writer. Setting
+SHARED_CACHE_URL to a redis:// URL shares it across hosts instead. Besides
+values with TTLs, backends provide lease locks, so exactly one process
+refreshes a key while the others keep reading.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from models import Article
+
+DEFAULT_SHARED_CACHE_PATH = os.path.join(".cache", "shared.db")
+DEFAULT_LOCK_TTL = 30.0  # Seconds before a crashed lock holder's lease lapses
+DEFAULT_POLL_INTERVAL = 0.1
+TOUCH_INTERVAL = 60.0  # Seconds between access-time updates of an entry, so reads rarely write
+DEFAULT_UPDATE_TTL = 5.0  # Lease on a key while update() changes it
+UPDATE_POLL_INTERVAL = 0.005
+ARTICLE_TAG = "__article__"
+
+
+def _encode_default(value):
+    if isinstance(value, Article):
+        return {ARTICLE_TAG: value.to_dict()}
+    raise TypeError(f"{type(value).__name__} cannot be stored in the shared cache")
+
+
+def _decode_object(data):
+    if len(data) == 1 and ARTICLE_TAG in data:
+        return Article.from_dict(data[ARTICLE_TAG])
+    return data
+
+
+def encode_value(value):
+    """Serialize a cache value as JSON; Articles are tagged and rebuilt on load.
+
+    JSON rather than pickle, so whoever can write to a shared backend
+    (e.g. Redis) cannot make the processes reading it run code.
+    """
+    return json.dumps(value, default=_encode_default, ensure_ascii=False).encode("utf-8")
+
+
+def decode_value(data):
+    return json.loads(data, object_hook=_decode_object)
+
+
+class SQLiteBackend:
+    """Key/value rows and leases in a WAL-mode SQLite file shared by local processes"""
+
+    def __init__(self, path=DEFAULT_SHARED_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (accessed_at)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def get(self, key, touch=True):
+        """Return (value bytes, stored_at), or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+                return None
+            # LRU order only needs to be roughly right, so hot entries are not rewritten on every hit
+            if touch and now - accessed_at > TOUCH_INTERVAL:
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return value, stored_at
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, stored_at, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now + ttl if ttl else None, now),
+            )
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self, prefix):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def count(self, prefix):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchone()[0]
+
+    def evict(self, prefix, max_entries):
+        """Drop expired entries, then the least recently used ones of prefix over max_entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                if max_entries:
+                    self._conn.execute("""
+                        DELETE FROM entries WHERE key IN (
+                            SELECT key FROM entries WHERE substr(key, 1, ?) = ?
+                            ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (len(prefix), prefix, max_entries))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def acquire(self, key, owner, ttl):
+        """Take the lease on key unless a live one exists. Returns True on success."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute("""
+                INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.expires_at <= ?
+            """, (key, owner, now + ttl, now))
+            return cursor.rowcount == 1
+
+    def release(self, key, owner):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+
+class RedisBackend:
+    """Entries as Redis hashes and leases as SET NX keys, shared by every host"""
+
+    _RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SHARED_CACHE_URL points at Redis but the redis package is not installed") from e
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+        self._release = self._client.register_script(self._RELEASE_SCRIPT)
+
+    def get(self, key, touch=True):
+        value, stored_at = self._client.hmget(key, "value", "stored_at")
+        if value is None:
+            return None
+        return value, float(stored_at)
+
+    def set(self, key, value, ttl=None):
+        pipe = self._client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={"value": value, "stored_at": time.time()})
+        if ttl:
+            pipe.pexpire(key, int(ttl * 1000))
+        pipe.execute()
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def _keys(self, prefix):
+        return list(self._client.scan_iter(match=f"{prefix}*"))
+
+    def clear(self, prefix):
+        keys = self._keys(prefix)
+        if keys:
+            self._client.delete(*keys)
+
+    def count(self, prefix):
+        return len(self._keys(prefix))
+
+    def evict(self, prefix, max_entries):
+        """Redis evicts by its own maxmemory policy"""
+
+    def acquire(self, key, owner, ttl):
+        return bool(self._client.set(f"lease:{key}", owner, nx=True, px=int(ttl * 1000)))
+
+    def release(self, key, owner):
+        self._release(keys=[f"lease:{key}"], args=[owner])
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the process-wide backend: Redis if SHARED_CACHE_URL is set, else the host's SQLite file"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                url = os.getenv("SHARED_CACHE_URL")
+                if url:
+                    _backend = RedisBackend(url)
+                else:
+                    _backend = SQLiteBackend(os.getenv("SHARED_CACHE_PATH", DEFAULT_SHARED_CACHE_PATH))
+    return _backend
+
+
+class SharedCache:
+    """A namespace of JSON values (strings, lists, dicts, Articles) on a shared backend, with cross-process single-flight"""
+
+    def __init__(self, backend=None, namespace="", ttl=None, max_entries=None):
+        self.backend = backend or get_backend()
+        self.prefix = f"{namespace}:" if namespace else ""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def get_entry(self, key):
+        """Return (value, stored_at), or None"""
+        row = self.backend.get(self.prefix + key)
+        if row is None:
+            return None
+        try:
+            return decode_value(row[0]), row[1]
+        except (ValueError, TypeError, KeyError):
+            return None  # Written by an incompatible version; treat as a miss
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(self.prefix + key, encode_value(value), ttl or self.ttl)
+        self._writes += 1
+        # Evicting on every write would make each one scan the table
+        if self.max_entries and self._writes % 100 == 0:
+            self.backend.evict(self.prefix, self.max_entries)
+
+    def delete(self, key):
+        self.backend.delete(self.prefix + key)
+
+    def clear(self):
+        self.backend.clear(self.prefix)
+
+    def __len__(self):
+        return self.backend.count(self.prefix)
+
+    def acquire(self, key, ttl=DEFAULT_LOCK_TTL):
+        """Take the cross-process lock on key. Returns a token for release(), or None if it is held."""
+        token = f"{os.getpid()}-{uuid.uuid4().hex}"
+        return token if self.backend.acquire(self.prefix + key, token, ttl) else None
+
+    def release(self, key, token):
+        self.backend.release(self.prefix + key, token)
+
+    def update(self, key, change, ttl=None, timeout=DEFAULT_UPDATE_TTL):
+        """Replace key's value with change(current value or None) under its lease. Returns the new value.
+
+        Updates from every process are applied one at a time, so counters
+        kept this way are never lost to interleaved read-modify-writes.
+        Raises TimeoutError if the lease cannot be taken within timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            token = self.acquire(key, ttl=DEFAULT_UPDATE_TTL)
+            if token is not None:
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Lease on {self.prefix}{key} not released within {timeout}s")
+            time.sleep(UPDATE_POLL_INTERVAL)
+        try:
+            value = change(self.get(key))
+            self.set(key, value, ttl)
+            return value
+        finally:
+            self.release(key, token)
+
+    def wait_for(self, key, newer_than=0.0, timeout=DEFAULT_LOCK_TTL, interval=DEFAULT_POLL_INTERVAL):
+        """Poll until key holds an entry stored after newer_than. Returns the entry, or None on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self.get_entry(key)
+            if entry is not None and entry[1] > newer_than:
+                return entry
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
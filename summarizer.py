@@ -0,0 +1,569 @@
+"""
+Concurrent Summarization Engine for Tech News App
+"""
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+import requests
+
+import http_client
+
+from local_summarizer import summarize_locally
+from summary_cache import make_key
+from summary_scheduler import PriorityScheduler, TokenBudget, estimate_tokens, PRIORITY_VISIBLE, PRIORITY_NEXT_PAGE
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# Summarization settings (also part of the summary cache key)
+OPENROUTER_MODEL = "openai/gpt-4o-mini"
+SUMMARY_SYSTEM_PROMPT = "You are an expert AI news summarizer. Summarize briefly in 2-3 sentences."
+SUMMARY_TEMPERATURE = 0.7
+SUMMARY_MAX_TOKENS = 150
+BATCH_SYSTEM_PROMPT = (
+    "You are an expert AI news summarizer. You will receive several articles, each with an id. "
+    "Summarize each one briefly in 2-3 sentences. Reply with JSON only, in the form "
+    '{"summaries": [{"id": "<id>", "summary": "<summary>"}]}.'
+)
+
+# A worker and a burst token per card of a default feed page, so a page is summarized in one wave
+DEFAULT_MAX_WORKERS = 15
+DEFAULT_RATE = 5.0  # Requests per second
+DEFAULT_BURST = 15
+DEFAULT_RETRY_AFTER = 5.0
+DEFAULT_BATCH_SIZE = 1  # 1 keeps the one-request-per-article path
+
+# summary is always displayable; warning is a user-facing message or None
+SummaryResult = namedtuple("SummaryResult", ["summary", "warning", "ok", "retry_after", "usage"], defaults=(None,))
+
+
+class TokenBucket:
+    """Thread-safe token bucket that can be paused after a 429"""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for the given number of seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def _retry_after(response):
+    """Read the Retry-After header in seconds, with a sane default"""
+    try:
+        return float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def _error_message(response, default):
+    """Extract an OpenRouter error message from a response body"""
+    try:
+        return response.json().get("error", {}).get("message", default)
+    except Exception:
+        return default
+
+
+def request_summary(title, description, api_key, timeout=30):
+    """Summarize one article with OpenRouter without touching the Streamlit UI"""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    payload = {
+        "model": OPENROUTER_MODEL,
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Title: {title}\n\nDescription: {description}\n\nSummarize this for a tech news digest."}
+        ],
+        "max_tokens": SUMMARY_MAX_TOKENS,
+        "temperature": SUMMARY_TEMPERATURE
+    }
+
+    try:
+        # Completions are billed and not idempotent, so a slow or failed call is never sent twice
+        response = http_client.post(OPENROUTER_URL, json=payload, headers=headers, timeout=timeout, retries=0)
+        if response.status_code == 200:
+            data = response.json()
+            if "choices" in data and len(data["choices"]) > 0:
+                return SummaryResult(data["choices"][0]["message"]["content"].strip(), None, True, None, data.get("usage"))
+            return SummaryResult(description, None, False, None, data.get("usage"))
+        elif response.status_code == 401:
+            return SummaryResult(description, "⚠️ Invalid OpenRouter API key. Using a local summary.", False, None)
+        elif response.status_code == 429:
+            return SummaryResult(description, "⏰ OpenRouter rate limit exceeded. Using a local summary.", False, _retry_after(response))
+        elif response.status_code == 400:
+            error_msg = _error_message(response, "Bad request")
+            return SummaryResult(description, f"OpenRouter API error: {error_msg}. Using a local summary.", False, None)
+        else:
+            error_msg = _error_message(response, f"Status {response.status_code}")
+            return SummaryResult(description, f"OpenRouter API error: {error_msg}. Using a local summary.", False, None)
+    except http_client.CircuitOpenError:
+        # OpenRouter is known to be down; the app shows one notice instead of a warning per card
+        return SummaryResult(description, None, False, None)
+    except requests.exceptions.Timeout:
+        return SummaryResult(description, "⏱️ OpenRouter request timed out. Using a local summary.", False, None)
+    except requests.exceptions.ConnectionError:
+        return SummaryResult(description, "🌐 OpenRouter connection error. Using a local summary.", False, None)
+    except Exception as e:
+        return SummaryResult(description, f"OpenRouter summarization failed: {e}. Using a local summary.", False, None)
+
+
+def stream_summary(title, description, api_key, timeout=30):
+    """Stream one article summary from OpenRouter, yielding text deltas.
+
+    Raises requests exceptions, or RuntimeError for a non-200 response, so
+    callers can fall back before any text has been shown.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    payload = {
+        "model": OPENROUTER_MODEL,
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Title: {title}\n\nDescription: {description}\n\nSummarize this for a tech news digest."}
+        ],
+        "max_tokens": SUMMARY_MAX_TOKENS,
+        "temperature": SUMMARY_TEMPERATURE,
+        "stream": True
+    }
+
+    with http_client.post(OPENROUTER_URL, json=payload, headers=headers, timeout=timeout, stream=True,
+                          retries=0, kind="stream") as response:
+        if response.status_code != 200:
+            raise RuntimeError(_error_message(response, f"Status {response.status_code}"))
+
+        for line in response.iter_lines(decode_unicode=True):
+            # Skip keep-alive comments and blank separators
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                continue
+            choices = chunk.get("choices") or [{}]
+            delta = (choices[0].get("delta") or {}).get("content")
+            if delta:
+                yield delta
+
+
+class SummaryMetrics:
+    """Thread-safe request, token and wall-time counters per summarization mode"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes = {}
+
+    def record(self, mode, articles, seconds, usage=None):
+        """Record one OpenRouter round trip covering the given number of articles"""
+        usage = usage or {}
+        with self._lock:
+            stats = self._modes.setdefault(mode, {
+                "requests": 0, "articles": 0, "prompt_tokens": 0,
+                "completion_tokens": 0, "request_seconds": 0.0,
+            })
+            stats["requests"] += 1
+            stats["articles"] += articles
+            stats["prompt_tokens"] += usage.get("prompt_tokens", 0) or 0
+            stats["completion_tokens"] += usage.get("completion_tokens", 0) or 0
+            stats["request_seconds"] += seconds
+
+    def snapshot(self):
+        """Return a copy of the counters with per-article averages"""
+        with self._lock:
+            result = {}
+            for mode, stats in self._modes.items():
+                stats = dict(stats)
+                articles = max(stats["articles"], 1)
+                stats["tokens_per_article"] = (stats["prompt_tokens"] + stats["completion_tokens"]) / articles
+                stats["seconds_per_article"] = stats["request_seconds"] / articles
+                result[mode] = stats
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._modes.clear()
+
+
+def _parse_batch_content(content):
+    """Parse a batch reply into {id: summary}, tolerating code fences"""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json"):]
+    data = json.loads(text)
+    entries = data.get("summaries", []) if isinstance(data, dict) else data
+
+    summaries = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        summary = entry.get("summary")
+        if isinstance(summary, str) and summary.strip():
+            summaries[str(entry.get("id"))] = summary.strip()
+    return summaries
+
+
+def request_batch_summary(items, api_key, timeout=30):
+    """Summarize several (id, title, description) items in one request.
+
+    Returns (summaries_by_id, usage, retry_after). Items missing from the
+    returned mapping could not be summarized or parsed.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    articles_text = "\n\n".join(
+        f"[id: {item_id}]\nTitle: {title}\nDescription: {description}"
+        for item_id, title, description in items
+    )
+    payload = {
+        "model": OPENROUTER_MODEL,
+        "messages": [
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Summarize these articles for a tech news digest.\n\n{articles_text}"}
+        ],
+        "max_tokens": SUMMARY_MAX_TOKENS * len(items),
+        "temperature": SUMMARY_TEMPERATURE,
+        "response_format": {"type": "json_object"}
+    }
+
+    try:
+        response = http_client.post(OPENROUTER_URL, json=payload, headers=headers, timeout=timeout, retries=0, kind="batch")
+        if response.status_code == 429:
+            return {}, None, _retry_after(response)
+        if response.status_code != 200:
+            return {}, None, None
+        data = response.json()
+        usage = data.get("usage")
+        if not data.get("choices"):
+            return {}, usage, None
+        try:
+            return _parse_batch_content(data["choices"][0]["message"]["content"]), usage, None
+        except (ValueError, AttributeError, TypeError):
+            return {}, usage, None
+    except Exception:
+        return {}, None, None
+
+
+class SummarizationEngine:
+    """Fan summary requests out over a bounded, rate-limited, priority-ordered worker pool.
+
+    Articles already being summarized are not scheduled again: submitting
+    one that is in flight, for example after prefetch(), joins its future
+    and raises its priority if needed. Requests that would exceed the
+    token budget fall back to a local extractive summary.
+    """
+
+    def __init__(self, api_key, cache=None, max_workers=DEFAULT_MAX_WORKERS,
+                 rate=DEFAULT_RATE, burst=DEFAULT_BURST, timeout=30, batch_size=DEFAULT_BATCH_SIZE,
+                 budget=None):
+        self.api_key = api_key
+        self.cache = cache
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.bucket = TokenBucket(rate, burst)
+        self.budget = budget or TokenBudget()
+        self.metrics = SummaryMetrics()
+        self.scheduler = PriorityScheduler(max_workers)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def _join(self, pair, priority):
+        """Future of an in-flight summary of pair, promoted to priority; call with self._lock held"""
+        entry = self._in_flight.get(pair)
+        if entry is None:
+            return None
+        future, task = entry
+        self.scheduler.promote(task, priority)
+        return future
+
+    def _track(self, pair, future, task):
+        """Register an in-flight future for (title, description); call with self._lock held"""
+        self._in_flight[pair] = (future, task)
+        future.add_done_callback(lambda f: self._untrack(pair, f))
+
+    def _untrack(self, pair, future):
+        with self._lock:
+            entry = self._in_flight.get(pair)
+            if entry is not None and entry[0] is future:
+                del self._in_flight[pair]
+
+    def _fallback(self, title, description):
+        """Local extractive summary used without calling OpenRouter: no key, budget spent or circuit open"""
+        return SummaryResult(summarize_locally(title, description), None, False, None)
+
+    def quick_summary(self, title, description):
+        """Instant local summary to show while the OpenRouter one is pending"""
+        if not description:
+            return "No description available."
+        return summarize_locally(title, description)
+
+    def summarize(self, title, description, priority=PRIORITY_VISIBLE):
+        """Summarize one article, falling back to the local summary on any failure"""
+        if not description:
+            return SummaryResult("No description available.", None, False, None)
+
+        if not self.api_key:
+            return self._fallback(title, description)  # fallback if API key missing
+
+        cached_summary = self._cached(title, description)
+        if cached_summary is not None:
+            return SummaryResult(cached_summary, None, True, None)
+
+        if http_client.circuit_open(OPENROUTER_URL):
+            return self._fallback(title, description)
+
+        cache_key = make_key(title, description, OPENROUTER_MODEL, SUMMARY_SYSTEM_PROMPT, SUMMARY_TEMPERATURE)
+        lease = self.cache.acquire(cache_key, ttl=self.timeout) if self.cache is not None else None
+        if self.cache is not None and lease is None:
+            # Another process is summarizing this article; use its result instead of paying twice
+            entry = self.cache.wait_for(cache_key, timeout=self.timeout)
+            if entry is not None:
+                return SummaryResult(entry[0], None, True, None)
+
+        try:
+            reservation = self.budget.reserve(
+                estimate_tokens(f"{SUMMARY_SYSTEM_PROMPT}{title}{description}"), SUMMARY_MAX_TOKENS, priority)
+            if reservation is None:
+                return self._fallback(title, description)
+
+            self.bucket.acquire()
+            started = time.monotonic()
+            result = request_summary(title, description, self.api_key, timeout=self.timeout)
+            self.metrics.record("single", 1, time.monotonic() - started, result.usage)
+            self.budget.settle(reservation, result.usage, sent=result.ok or bool(result.usage))
+            if result.retry_after:
+                self.bucket.pause(result.retry_after)
+            if result.ok and self.cache is not None:
+                self.cache.set(cache_key, result.summary)
+        finally:
+            if lease is not None:
+                self.cache.release(cache_key, lease)
+        if not result.ok:
+            # Failed requests keep their warning but show the local summary, not the raw description
+            result = result._replace(summary=summarize_locally(title, description))
+        return result
+
+    def submit(self, title, description, priority=PRIORITY_VISIBLE):
+        """Schedule a summary and return its future"""
+        pair = (title, description)
+        with self._lock:
+            future = self._join(pair, priority)
+            if future is None:
+                task = self.scheduler.submit(self.summarize, title, description, priority, priority=priority)
+                future = task.future
+                self._track(pair, future, task)
+        return future
+
+    def cached_summary(self, title, description):
+        """Return a cached summary without any network call, or None"""
+        if not description or not self.api_key:
+            return None
+        return self._cached(title, description)
+
+    def _cached(self, title, description):
+        """Look up a summary produced by either the single or the batch prompt"""
+        if self.cache is None:
+            return None
+        for prompt in (SUMMARY_SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT):
+            summary = self.cache.get(make_key(title, description, OPENROUTER_MODEL, prompt, SUMMARY_TEMPERATURE))
+            if summary is not None:
+                return summary
+        return None
+
+    def _summarize_batch(self, batch, priority=PRIORITY_VISIBLE):
+        """Summarize a list of (title, description) pairs with one request, per-article on failure"""
+        items = [(str(n), title, description) for n, (title, description) in enumerate(batch)]
+        reservation = self.budget.reserve(
+            estimate_tokens(BATCH_SYSTEM_PROMPT + "".join(t + d for _, t, d in items)),
+            SUMMARY_MAX_TOKENS * len(items), priority)
+        if reservation is None or http_client.circuit_open(OPENROUTER_URL):
+            self.budget.settle(reservation, sent=False)
+            return [self._fallback(title, description) for _, title, description in items]
+        self.bucket.acquire()
+        started = time.monotonic()
+        summaries, usage, retry_after = request_batch_summary(items, self.api_key, timeout=self.timeout)
+        self.metrics.record("batch", len(items), time.monotonic() - started, usage)
+        self.budget.settle(reservation, usage, sent=bool(summaries or usage))
+        if retry_after:
+            self.bucket.pause(retry_after)
+
+        results = []
+        for item_id, title, description in items:
+            summary = summaries.get(item_id)
+            if summary is None:
+                results.append(self.summarize(title, description, priority))
+                continue
+            if self.cache is not None:
+                self.cache.set(make_key(title, description, OPENROUTER_MODEL, BATCH_SYSTEM_PROMPT, SUMMARY_TEMPERATURE), summary)
+            results.append(SummaryResult(summary, None, True, None))
+        return results
+
+    def _resolve_batch(self, batch, futures, priority):
+        """Run one batch on a worker thread and resolve its per-article futures"""
+        try:
+            results = self._summarize_batch(batch, priority)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def submit_many(self, articles, priority=PRIORITY_VISIBLE):
+        """Schedule summaries for Articles, returning one future per article in input order"""
+        pairs = [(a.title, a.description) for a in articles]
+        if self.batch_size == 1 or not self.api_key:
+            return [self.submit(title, description, priority) for title, description in pairs]
+
+        futures = [Future() for _ in pairs]
+        pending = []
+        for n, (title, description) in enumerate(pairs):
+            cached_summary = self._cached(title, description) if description else None
+            if not description:
+                futures[n].set_result(SummaryResult("No description available.", None, False, None))
+            elif cached_summary is not None:
+                futures[n].set_result(SummaryResult(cached_summary, None, True, None))
+            else:
+                pending.append(n)
+
+        with self._lock:
+            chunk = []
+            for n in pending:
+                in_flight = self._join(pairs[n], priority)
+                if in_flight is not None:
+                    futures[n] = in_flight
+                else:
+                    chunk.append(n)
+            for i in range(0, len(chunk), self.batch_size):
+                members = chunk[i:i + self.batch_size]
+                task = self.scheduler.submit(self._resolve_batch, [pairs[n] for n in members],
+                                             [futures[n] for n in members], priority, priority=priority)
+                for n in members:
+                    self._track(pairs[n], futures[n], task)
+        return futures
+
+    def summarize_many(self, articles, priority=PRIORITY_VISIBLE):
+        """Summarize Articles concurrently, returning results in input order"""
+        return [future.result() for future in self.submit_many(articles, priority)]
+
+    def prefetch(self, articles, priority=PRIORITY_NEXT_PAGE):
+        """Summarize Articles in the background so they are cached before they are shown.
+
+        Returns the number of articles that still needed a summary.
+        """
+        articles = [a for a in articles if self.cached_summary(a.title, a.description) is None]
+        if articles and self.api_key:
+            self.submit_many(articles, priority)
+        return len(articles)
+
+    def stats(self):
+        """Queue depth, wait times and spend, for the footer and worker logs"""
+        return {"queue": self.scheduler.stats(), "budget": self.budget.snapshot()}
+
+    def stream(self, title, description):
+        """Yield SummaryResult snapshots as summary text streams in.
+
+        Every snapshot carries the text received so far; the last one is
+        final. Cached and fallback summaries arrive as a single snapshot.
+        """
+        if not description or not self.api_key:
+            yield self.summarize(title, description)
+            return
+
+        cached_summary = self._cached(title, description)
+        if cached_summary is not None:
+            yield SummaryResult(cached_summary, None, True, None)
+            return
+
+        reservation = None if http_client.circuit_open(OPENROUTER_URL) else self.budget.reserve(
+            estimate_tokens(f"{SUMMARY_SYSTEM_PROMPT}{title}{description}"), SUMMARY_MAX_TOKENS)
+        if reservation is None:
+            yield self._fallback(title, description)
+            return
+
+        self.bucket.acquire()
+        started = time.monotonic()
+        text = ""
+        try:
+            for delta in stream_summary(title, description, self.api_key, timeout=self.timeout):
+                text += delta
+                yield SummaryResult(text, None, False, None)
+        except Exception as e:
+            if not text:
+                # Completions are never re-sent; nothing streamed yet, so show the local summary
+                self.budget.settle(reservation, sent=False)
+                yield SummaryResult(summarize_locally(title, description),
+                                    f"OpenRouter stream failed: {e}. Using a local summary.", False, None)
+                return
+            yield SummaryResult(text.strip(), f"OpenRouter stream interrupted: {e}.", False, None)
+            return
+        self.metrics.record("stream", 1, time.monotonic() - started)
+
+        if not text.strip():
+            yield self._fallback(title, description)
+            return
+        if self.cache is not None:
+            self.cache.set(make_key(title, description, OPENROUTER_MODEL, SUMMARY_SYSTEM_PROMPT, SUMMARY_TEMPERATURE), text.strip())
+        yield SummaryResult(text.strip(), None, True, None)
+
+    def submit_stream(self, key, title, description, updates):
+        """Stream a summary on a worker thread, putting (key, result) snapshots on a queue.
+
+        A final (key, None) marks the end of the stream.
+        """
+        with self._lock:
+            in_flight = self._join((title, description), PRIORITY_VISIBLE)
+
+        def run():
+            try:
+                if in_flight is not None:
+                    # Already being summarized by a prefetch; wait for it instead of paying twice
+                    updates.put((key, in_flight.result()))
+                    return
+                for result in self.stream(title, description):
+                    updates.put((key, result))
+            except Exception as e:
+                updates.put((key, SummaryResult(self.quick_summary(title, description),
+                                                f"OpenRouter summarization failed: {e}. Using a local summary.", False, None)))
+            finally:
+                updates.put((key, None))
+
+        return self.scheduler.submit(run).future
@@ -0,0 +1,31 @@
+"""
+Persistent Summary Cache for Tech News App
+"""
+import hashlib
+import json
+
+from shared_cache import SharedCache
+
+DEFAULT_TTL = 7 * 24 * 3600  # One week
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def make_key(title, description, model, prompt, temperature):
+    """Build a content-addressed cache key for a summary request"""
+    material = json.dumps(
+        [title or "", description or "", model, prompt, float(temperature)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SummaryCache(SharedCache):
+    """Summaries in the shared cache, with TTL and LRU eviction.
+
+    Every process on the host (or every host, with a Redis backend) sees
+    the same summaries, and acquire()/wait_for() let one process summarize
+    an article while the others wait for its result.
+    """
+
+    def __init__(self, backend=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        super().__init__(backend, namespace="summary", ttl=ttl, max_entries=max_entries)
@@ -0,0 +1,278 @@
+"""
+Priority Summarization Scheduler for Tech News App
+
+Summaries run on a fixed pool of worker threads fed from a priority queue,
+so cards on screen are summarized before the next page and the next page
+before background work. A token and cost budget caps OpenRouter spend per
+minute and per day across all processes; past it, callers fall back
+instead of sending requests.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+from shared_cache import SharedCache
+
+PRIORITY_VISIBLE = 0
+PRIORITY_NEXT_PAGE = 1
+PRIORITY_BACKLOG = 2
+PRIORITY_NAMES = {PRIORITY_VISIBLE: "visible", PRIORITY_NEXT_PAGE: "next_page", PRIORITY_BACKLOG: "backlog"}
+
+DEFAULT_TOKENS_PER_MINUTE = 50000
+DEFAULT_TOKENS_PER_DAY = 2000000
+DEFAULT_COST_PER_DAY = 1.0  # USD
+# USD per million tokens for the default model (openai/gpt-4o-mini)
+DEFAULT_PROMPT_PRICE = 0.15
+DEFAULT_COMPLETION_PRICE = 0.60
+DEFAULT_BACKLOG_SHARE = 0.5  # Background work stops at this share of each limit
+CHARS_PER_TOKEN = 4
+WAIT_SAMPLES = 200
+BUDGET_KEY = "counters"
+BUDGET_TTL = 2 * 86400  # Counters outlive the day they count
+
+
+def estimate_tokens(text):
+    """Rough prompt token count, used to reserve budget before a request"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class TokenBudget:
+    """Per-minute and per-day token and cost limits on OpenRouter spend.
+
+    Requests reserve their estimated tokens up front and settle to the
+    usage OpenRouter reports afterwards. A limit of 0 disables it.
+    Background work may only use backlog_share of each limit, leaving the
+    rest for readers. With a SharedCache as store, the counters live in the
+    shared cache, so the limits hold across every web and ingestion process;
+    without one they are counted per process.
+    """
+
+    def __init__(self, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, tokens_per_day=DEFAULT_TOKENS_PER_DAY,
+                 cost_per_day=DEFAULT_COST_PER_DAY, prompt_price=DEFAULT_PROMPT_PRICE,
+                 completion_price=DEFAULT_COMPLETION_PRICE, backlog_share=DEFAULT_BACKLOG_SHARE, store=None):
+        self.tokens_per_minute = tokens_per_minute
+        self.tokens_per_day = tokens_per_day
+        self.cost_per_day = cost_per_day
+        self.prompt_price = prompt_price
+        self.completion_price = completion_price
+        self.backlog_share = backlog_share
+        self.store = store
+
+        self._lock = threading.Lock()
+        self._counters = None
+        self._denied = {name: 0 for name in PRIORITY_NAMES.values()}
+        self._last_denied = 0.0
+
+    def cost(self, prompt_tokens, completion_tokens):
+        return (prompt_tokens * self.prompt_price + completion_tokens * self.completion_price) / 1000000
+
+    @staticmethod
+    def _roll(counters):
+        """Counters for the current minute and day, starting new windows when the clock has moved on"""
+        counters = dict(counters or {})
+        minute = int(time.time() // 60)
+        day = datetime.now(timezone.utc).date().isoformat()
+        if counters.get("minute") != minute:
+            counters.update(minute=minute, minute_tokens=0)
+        if counters.get("day") != day:
+            counters.update(day=day, day_tokens=0, day_cost=0.0)
+        return counters
+
+    def _apply(self, change):
+        """Run change(counters) on the current counters, in the shared cache if there is one, and return its result"""
+        result = []
+
+        def apply(counters):
+            counters = self._roll(counters)
+            result.append(change(counters))
+            return counters
+
+        with self._lock:
+            if self.store is not None:
+                try:
+                    self.store.update(BUDGET_KEY, apply, ttl=BUDGET_TTL)
+                    return result[0]
+                except Exception:
+                    # Shared cache unavailable: keep counting in this process so spend stays capped
+                    result.clear()
+            self._counters = apply(self._counters)
+            return result[0]
+
+    def reserve(self, prompt_tokens, completion_tokens, priority=PRIORITY_VISIBLE):
+        """Reserve budget for one request. Returns a reservation, or None when over budget."""
+        tokens = prompt_tokens + completion_tokens
+        cost = self.cost(prompt_tokens, completion_tokens)
+        share = self.backlog_share if priority >= PRIORITY_BACKLOG else 1.0
+
+        def take(counters):
+            over = (
+                (self.tokens_per_minute and counters["minute_tokens"] + tokens > self.tokens_per_minute * share)
+                or (self.tokens_per_day and counters["day_tokens"] + tokens > self.tokens_per_day * share)
+                or (self.cost_per_day and counters["day_cost"] + cost > self.cost_per_day * share)
+            )
+            if over:
+                return None
+            counters["minute_tokens"] += tokens
+            counters["day_tokens"] += tokens
+            counters["day_cost"] += cost
+            return (counters["minute"], counters["day"], tokens, cost)
+
+        reservation = self._apply(take)
+        if reservation is None:
+            with self._lock:
+                self._denied[PRIORITY_NAMES.get(priority, "backlog")] += 1
+                self._last_denied = time.monotonic()
+        return reservation
+
+    def settle(self, reservation, usage=None, sent=True):
+        """Replace a reservation with the reported usage, or release it if nothing was billed"""
+        if reservation is None:
+            return
+        minute, day, tokens, cost = reservation
+        if not sent:
+            actual_tokens, actual_cost = 0, 0.0
+        elif usage:
+            prompt_tokens = usage.get("prompt_tokens", 0) or 0
+            completion_tokens = usage.get("completion_tokens", 0) or 0
+            actual_tokens = prompt_tokens + completion_tokens
+            actual_cost = self.cost(prompt_tokens, completion_tokens)
+        else:
+            return  # Keep the estimate
+
+        def correct(counters):
+            if minute == counters["minute"]:
+                counters["minute_tokens"] += actual_tokens - tokens
+            if day == counters["day"]:
+                counters["day_tokens"] += actual_tokens - tokens
+                counters["day_cost"] += actual_cost - cost
+
+        self._apply(correct)
+
+    def exhausted(self, within=60):
+        """True if a request from this process was refused in the last `within` seconds"""
+        with self._lock:
+            return bool(self._last_denied) and time.monotonic() - self._last_denied < within
+
+    def snapshot(self):
+        counters = None
+        if self.store is not None:
+            try:
+                counters = self.store.get(BUDGET_KEY)
+            except Exception:
+                pass
+        with self._lock:
+            # Read-only: the footer polls this on every rerun
+            counters = self._roll(counters if counters is not None else self._counters)
+            denied = dict(self._denied)
+        return {
+            "minute_tokens": counters["minute_tokens"],
+            "day_tokens": counters["day_tokens"],
+            "day_cost": round(counters["day_cost"], 6),
+            "denied": denied,
+        }
+
+
+def budget_from_env():
+    """Build a TokenBudget from SUMMARY_* budget settings, counted in the shared cache"""
+    return TokenBudget(
+        tokens_per_minute=int(os.getenv("SUMMARY_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)),
+        tokens_per_day=int(os.getenv("SUMMARY_TOKENS_PER_DAY", DEFAULT_TOKENS_PER_DAY)),
+        cost_per_day=float(os.getenv("SUMMARY_COST_PER_DAY", DEFAULT_COST_PER_DAY)),
+        prompt_price=float(os.getenv("SUMMARY_PROMPT_PRICE", DEFAULT_PROMPT_PRICE)),
+        completion_price=float(os.getenv("SUMMARY_COMPLETION_PRICE", DEFAULT_COMPLETION_PRICE)),
+        backlog_share=float(os.getenv("SUMMARY_BACKLOG_SHARE", DEFAULT_BACKLOG_SHARE)),
+        store=SharedCache(namespace="budget"),
+    )
+
+
+class Task:
+    """A queued call; its priority can be raised until a worker picks it up"""
+
+    __slots__ = ("fn", "args", "priority", "future", "submitted", "started")
+
+    def __init__(self, fn, args, priority):
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.future = Future()
+        self.submitted = time.monotonic()
+        self.started = False
+
+
+class PriorityScheduler:
+    """Fixed pool of worker threads serving tasks lowest priority number first, FIFO within a priority"""
+
+    def __init__(self, max_workers, name="summarizer"):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waits = {p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITY_NAMES}
+        for n in range(max_workers):
+            threading.Thread(target=self._work, name=f"{name}-{n}", daemon=True).start()
+
+    def submit(self, fn, *args, priority=PRIORITY_VISIBLE):
+        """Queue fn(*args) and return its Task; task.future resolves with the result"""
+        task = Task(fn, args, priority)
+        with self._cond:
+            heapq.heappush(self._heap, (priority, next(self._seq), task))
+            self._cond.notify()
+        return task
+
+    def promote(self, task, priority):
+        """Move a still-queued task up to a more urgent priority"""
+        with self._cond:
+            if task.started or priority >= task.priority:
+                return
+            task.priority = priority
+            # The old heap entry goes stale and is skipped when popped
+            heapq.heappush(self._heap, (priority, next(self._seq), task))
+            self._cond.notify()
+
+    def _next_task(self):
+        with self._cond:
+            while True:
+                while not self._heap:
+                    self._cond.wait()
+                priority, _, task = heapq.heappop(self._heap)
+                if task.started or priority != task.priority:
+                    continue
+                task.started = True
+                self._running += 1
+                self._waits.setdefault(priority, deque(maxlen=WAIT_SAMPLES)).append(
+                    time.monotonic() - task.submitted)
+                return task
+
+    def _work(self):
+        while True:
+            task = self._next_task()
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    try:
+                        task.future.set_result(task.fn(*task.args))
+                    except BaseException as e:
+                        task.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running -= 1
+
+    def stats(self):
+        """Queue depth per priority, running tasks and recent wait times in milliseconds"""
+        with self._cond:
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, task in self._heap:
+                if not task.started and priority == task.priority:
+                    queued[PRIORITY_NAMES.get(priority, "backlog")] += 1
+            waits = {}
+            for priority, samples in self._waits.items():
+                ordered = sorted(samples)
+                waits[PRIORITY_NAMES.get(priority, "backlog")] = {
+                    "avg_ms": 1000 * sum(ordered) / len(ordered) if ordered else 0.0,
+                    "p95_ms": 1000 * ordered[int(0.95 * (len(ordered) - 1))] if ordered else 0.0,
+                }
+            return {"queued": queued, "depth": sum(queued.values()), "running": self._running, "wait": waits}
@@ -0,0 +1,139 @@
+"""
+Stale-While-Revalidate Cache for Tech News App
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_SOFT_TTL = 600  # Serve without refreshing for ten minutes
+DEFAULT_HARD_TTL = 86400  # Block on a refresh once the value is a day old
+DEFAULT_REFRESH_TIMEOUT = 30  # Seconds another process may hold a refresh before this one takes over
+
+
+class StaleWhileRevalidateCache:
+    """Serve cached values instantly and refresh them in the background.
+
+    Younger than soft_ttl: served as is. Between soft_ttl and hard_ttl:
+    served immediately while one background refresh runs. Older than
+    hard_ttl (or missing): the caller waits for a refresh. Concurrent
+    refreshes of a key share a single load. A failed or invalid load never
+    replaces a good value; the previous value keeps being served.
+
+    With a SharedCache as store, values live in the shared cache and a
+    cross-process lock makes exactly one process refresh a key; the others
+    keep serving what is stored, or wait for the refreshed value.
+    """
+
+    def __init__(self, soft_ttl=DEFAULT_SOFT_TTL, hard_ttl=DEFAULT_HARD_TTL, is_valid=bool,
+                 store=None, refresh_timeout=DEFAULT_REFRESH_TIMEOUT):
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.is_valid = is_valid
+        self.store = store
+        self.refresh_timeout = refresh_timeout
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._in_flight = {}
+        self._errors = {}
+
+    def _entry(self, key):
+        """(value, loaded_at) from the store or this process, or None"""
+        if self.store is not None:
+            return self.store.get_entry(key)
+        with self._lock:
+            return self._entries.get(key)
+
+    def _save(self, key, value):
+        if self.store is not None:
+            self.store.set(key, value)
+        else:
+            with self._lock:
+                self._entries[key] = (value, time.time())
+
+    def get(self, key, loader):
+        """Return the value for key, loading it with loader() when needed.
+
+        Raises the loader's error only when there is no previous value to serve.
+        """
+        entry = self._entry(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.time() - loaded_at
+            if age < self.soft_ttl:
+                return value
+            if age < self.hard_ttl:
+                self._refresh(key, loader, background=True, entry=entry)
+                return value
+
+        future = self._refresh(key, loader, background=False, entry=entry)
+        try:
+            return future.result()
+        except Exception:
+            if entry is not None:
+                return entry[0]
+            raise
+
+    def _load(self, key, loader, entry):
+        """Run loader() under the cross-process lock, or take the value another process stored"""
+        token = None
+        if self.store is not None:
+            token = self.store.acquire(key, ttl=self.refresh_timeout)
+            if token is None:
+                # Another process is refreshing; wait for its result rather than loading twice
+                newer = self.store.wait_for(key, newer_than=entry[1] if entry else 0.0, timeout=self.refresh_timeout)
+                if newer is not None:
+                    return newer[0]
+        try:
+            value = loader()
+            if not self.is_valid(value):
+                raise ValueError("Refresh returned no usable data")
+            self._save(key, value)
+            return value
+        finally:
+            if token is not None:
+                self.store.release(key, token)
+
+    def _refresh(self, key, loader, background, entry=None):
+        """Start a single-flight load of key, or join the one in progress"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._in_flight[key] = future
+
+        def run():
+            try:
+                value = self._load(key, loader, entry)
+                with self._lock:
+                    self._errors.pop(key, None)
+                future.set_result(value)
+            except Exception as e:
+                with self._lock:
+                    self._errors[key] = e
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+
+        if background:
+            threading.Thread(target=run, name=f"swr-refresh-{key}", daemon=True).start()
+        else:
+            run()
+        return future
+
+    def last_error(self, key):
+        """Error from the most recent failed refresh of key, if any"""
+        with self._lock:
+            return self._errors.get(key)
+
+    def age(self, key):
+        """Seconds since key was last loaded successfully, or None"""
+        entry = self._entry(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def invalidate(self, key):
+        if self.store is not None:
+            self.store.delete(key)
+        with self._lock:
+            self._entries.pop(key, None)
@@ -0,0 +1,108 @@
+"""
+Verified ID Token Cache for Tech News App
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import http_client
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+DEFAULT_CERT_MAX_AGE = 3600  # Used when Google sends no Cache-Control max-age
+DEFAULT_EXPIRY_SKEW = 60  # Drop cached claims this many seconds before exp
+DEFAULT_MAX_ENTRIES = 1000
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def token_hash(token):
+    """Hash a token so raw credentials never become dictionary keys"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class CertificateCache:
+    """Google securetoken public certificates, refreshed per Cache-Control max-age"""
+
+    def __init__(self, url=GOOGLE_CERTS_URL):
+        self.url = url
+        self._certs = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fetch(self):
+        response = http_client.get(self.url, timeout=10)
+        response.raise_for_status()
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else DEFAULT_CERT_MAX_AGE
+        return response.json(), time.time() + max_age
+
+    def get(self):
+        """Return {key_id: PEM certificate}, fetching only when the cached set has expired"""
+        with self._lock:
+            if self._certs is None or time.time() >= self._expires_at:
+                try:
+                    self._certs, self._expires_at = self._fetch()
+                except Exception:
+                    # Keep serving the previous set; verification still checks signatures
+                    if self._certs is None:
+                        raise
+            return self._certs
+
+    def prefetch(self):
+        """Warm the certificate set on a background thread"""
+        def run():
+            try:
+                self.get()
+            except Exception:
+                pass
+
+        threading.Thread(target=run, name="cert-prefetch", daemon=True).start()
+
+
+class VerifiedTokenCache:
+    """Decoded claims of verified ID tokens, kept until shortly before they expire"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, expiry_skew=DEFAULT_EXPIRY_SKEW):
+        self.max_entries = max_entries
+        self.expiry_skew = expiry_skew
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """Return cached claims for a token, or None"""
+        key = token_hash(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, valid_until = entry
+                if time.time() < valid_until:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token, claims):
+        """Cache verified claims until exp minus the safety skew"""
+        valid_until = claims.get("exp", 0) - self.expiry_skew
+        if valid_until <= time.time():
+            return
+        key = token_hash(token)
+        with self._lock:
+            self._entries[key] = (claims, valid_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token):
+        with self._lock:
+            self._entries.pop(token_hash(token), None)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
@@ -0,0 +1,157 @@
+"""
+Firebase ID Token Refresh Manager for Tech News App
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+import http_client
+
+SECURETOKEN_URL = "https://securetoken.googleapis.com/v1/token"
+DEFAULT_REFRESH_MARGIN = 300  # Refresh five minutes before the ID token expires
+DEFAULT_IDLE_TIMEOUT = 2 * 3600  # Stop background refreshes for users not seen this long
+DEFAULT_EXPIRES_IN = 3600
+
+
+class TokenRefreshError(Exception):
+    """Raised when the securetoken endpoint rejects a refresh"""
+
+
+class TokenManager:
+    """Refresh ID tokens in the background before they expire.
+
+    Tokens are tracked per uid. Background refreshes store the new tokens
+    here and sync() copies them into a session's user dict, so a rerun
+    never blocks on identitytoolkit. Concurrent refreshes for the same uid
+    share one request.
+    """
+
+    def __init__(self, api_key, refresh_margin=DEFAULT_REFRESH_MARGIN, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.api_key = api_key
+        self.refresh_margin = refresh_margin
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._in_flight = {}
+        self._timers = {}
+        self._last_seen = {}
+
+    def track(self, user):
+        """Start managing a freshly signed-in user dict"""
+        user.setdefault("expires_at", time.time() + DEFAULT_EXPIRES_IN)
+        uid = user["uid"]
+        with self._lock:
+            self._tokens[uid] = {
+                "id_token": user["id_token"],
+                "refresh_token": user["refresh_token"],
+                "expires_at": user["expires_at"],
+            }
+            self._last_seen[uid] = time.time()
+        self._schedule(uid)
+
+    def untrack(self, uid):
+        """Forget a user, e.g. on logout"""
+        with self._lock:
+            self._tokens.pop(uid, None)
+            self._last_seen.pop(uid, None)
+            timer = self._timers.pop(uid, None)
+        if timer:
+            timer.cancel()
+
+    def sync(self, user):
+        """Copy the newest tokens into a session's user dict without any network call"""
+        uid = user.get("uid")
+        with self._lock:
+            latest = self._tokens.get(uid)
+            self._last_seen[uid] = time.time()
+            idle = uid not in self._timers
+        if latest is None:
+            if user.get("refresh_token"):
+                self.track(user)
+            return user
+        if idle:
+            # The user came back after background refreshes were suspended
+            self._schedule(uid)
+        if latest["expires_at"] > user.get("expires_at", 0):
+            user.update(latest)
+        return user
+
+    def ensure_fresh(self, user):
+        """Sync the user dict and refresh in the foreground only if the token is about to expire"""
+        self.sync(user)
+        if user.get("expires_at", 0) - time.time() < self.refresh_margin:
+            user.update(self.refresh(user["uid"]))
+        return user
+
+    def refresh(self, uid):
+        """Refresh a user's ID token, joining a refresh already in flight for that uid"""
+        with self._lock:
+            future = self._in_flight.get(uid)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[uid] = future
+                current = self._tokens.get(uid)
+
+        if not owner:
+            return future.result()
+
+        try:
+            if current is None:
+                raise TokenRefreshError("User is not tracked")
+            tokens = self._request_refresh(current["refresh_token"])
+            with self._lock:
+                if uid in self._tokens:
+                    self._tokens[uid] = tokens
+            future.set_result(tokens)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight.pop(uid, None)
+
+        if future.exception() is None:
+            self._schedule(uid)
+        return future.result()
+
+    def _request_refresh(self, refresh_token):
+        response = http_client.post(
+            f"{SECURETOKEN_URL}?key={self.api_key}",
+            data={"grant_type": "refresh_token", "refresh_token": refresh_token},
+            timeout=10,
+        )
+        data = response.json()
+        if response.status_code != 200:
+            raise TokenRefreshError(data.get("error", {}).get("message", f"Status {response.status_code}"))
+        return {
+            "id_token": data["id_token"],
+            "refresh_token": data["refresh_token"],
+            "expires_at": time.time() + int(data.get("expires_in", DEFAULT_EXPIRES_IN)),
+        }
+
+    def _schedule(self, uid, delay=None):
+        """Arm a timer that refreshes the uid's token shortly before it expires"""
+        with self._lock:
+            tokens = self._tokens.get(uid)
+            if tokens is None:
+                return
+            if time.time() - self._last_seen.get(uid, 0) > self.idle_timeout:
+                # Idle users are refreshed on demand by ensure_fresh() instead
+                self._timers.pop(uid, None)
+                return
+            old_timer = self._timers.get(uid)
+            if delay is None:
+                delay = max(0.0, tokens["expires_at"] - self.refresh_margin - time.time())
+            timer = threading.Timer(delay, self._background_refresh, args=(uid,))
+            timer.daemon = True
+            self._timers[uid] = timer
+        if old_timer:
+            old_timer.cancel()
+        timer.start()
+
+    def _background_refresh(self, uid):
+        try:
+            self.refresh(uid)
+        except Exception:
+            # Retry later; ensure_fresh() still refreshes in the foreground if needed
+            self._schedule(uid, delay=60)
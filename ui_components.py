@@ -1,230 +1,89 @@
 """
 Futuristic UI Components for Tech News App
 """
+import hashlib
+import os
+import time
+from functools import lru_cache
+from html import escape
+from string import Template
+
 import streamlit as st
+import streamlit.components.v1 as components
+
+# Served by Streamlit static file serving (see .streamlit/config.toml)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+THEME_STYLESHEET = "theme.css"
+# (family, weight range, file) of the self-hosted theme fonts, downloaded by fetch_fonts.py
+THEME_FONTS = (
+    ("Orbitron", "400 900", "fonts/orbitron-latin.woff2"),
+    ("Exo 2", "300 700", "fonts/exo2-latin.woff2"),
+)
+# Used until the font files have been downloaded, so the theme never drops to system fonts
+REMOTE_FONTS_URL = "https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Exo+2:wght@300;400;600;700&display=swap"
+FONT_FACE_TEMPLATE = Template(
+    "@font-face{font-family:'$family';font-style:normal;font-weight:$weight;font-display:swap;"
+    "src:url('$href') format('woff2');}"
+)
+
+# Invisible component reporting "ACCESS FULL ARTICLE" clicks back to Python
+_article_link = components.declare_component(
+    "article_link", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "article_link")
+)
+
+@lru_cache(maxsize=None)
+def _fingerprint(path):
+    """Short content hash of a static file, or None if it does not exist"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+    except OSError:
+        return None
+
+# Streamlit serves .css files as text/plain, which browsers refuse as a
+# stylesheet, so the fingerprinted file is fetched once and inlined into the
+# page head. Later reruns find it there and send only this loader.
+THEME_LOADER_TEMPLATE = Template("""<script>
+(function () {
+  var doc = window.parent.document;
+  if (doc.getElementById("theme-$version")) return;
+  window.parent.fetch(new URL("$href", doc.baseURI)).then(function (response) {
+    return response.text();
+  }).then(function (css) {
+    doc.querySelectorAll("style[id^='theme-']").forEach(function (old) { old.remove(); });
+    var style = doc.createElement("style");
+    style.id = "theme-$version";
+    style.textContent = css;
+    doc.head.appendChild(style);
+  });
+})();
+</script>""")
+
+@lru_cache(maxsize=1)
+def theme_head_html():
+    """Font tags: preloaded self-hosted fonts with content-hash URLs, or the Google Fonts stylesheet if any are missing"""
+    versions = [_fingerprint(os.path.join(STATIC_DIR, font)) for _, _, font in THEME_FONTS]
+    if not all(versions):
+        return f'<link rel="stylesheet" href="{REMOTE_FONTS_URL}">'
+    tags = []
+    faces = []
+    for (family, weight, font), version in zip(THEME_FONTS, versions):
+        href = f"{STATIC_URL}/{font}?v={version}"
+        tags.append(f'<link rel="preload" href="{href}" as="font" type="font/woff2" crossorigin>')
+        faces.append(FONT_FACE_TEMPLATE.substitute(family=family, weight=weight, href=href))
+    return "".join(tags) + f"<style>{''.join(faces)}</style>"
+
+@lru_cache(maxsize=1)
+def theme_loader_html():
+    """Script that inlines the fingerprinted theme stylesheet into the page once"""
+    version = _fingerprint(os.path.join(STATIC_DIR, THEME_STYLESHEET))
+    return THEME_LOADER_TEMPLATE.substitute(version=version, href=f"{STATIC_URL}/{THEME_STYLESHEET}?v={version}")
 
 def apply_futuristic_theme():
     """Apply futuristic cyberpunk theme"""
-    st.markdown("""
-    <style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Exo+2:wght@300;400;600;700&display=swap');
-    
-    /* Global Styles */
-    .stApp {
-        background: linear-gradient(135deg, #f8f4ff 0%, #e8d5f2 50%, #d4b3e8 100%);
-        color: #4a4a4a;
-        font-family: 'Exo 2', sans-serif;
-    }
-    
-    /* Main Container */
-    .main .block-container {
-        padding: 2rem 1rem;
-        max-width: 1200px;
-    }
-    
-    /* Headers */
-    h1 {
-        font-family: 'Orbitron', monospace;
-        font-weight: 900;
-        color: #8b5cf6;
-        text-shadow: 0 0 20px rgba(139, 92, 246, 0.3);
-        text-align: center;
-        margin-bottom: 2rem;
-        animation: glow 2s ease-in-out infinite alternate;
-    }
-    
-    h2 {
-        font-family: 'Orbitron', monospace;
-        color: #8b5cf6;
-        text-shadow: 0 0 10px rgba(139, 92, 246, 0.3);
-        border-bottom: 2px solid #8b5cf6;
-        padding-bottom: 0.5rem;
-        margin-top: 2rem;
-    }
-    
-    h3 {
-        font-family: 'Orbitron', monospace;
-        color: #ec4899;
-        text-shadow: 0 0 5px rgba(236, 72, 153, 0.3);
-    }
-    
-    /* Glow Animation */
-    @keyframes glow {
-        from { text-shadow: 0 0 20px rgba(139, 92, 246, 0.3); }
-        to { text-shadow: 0 0 30px rgba(139, 92, 246, 0.5), 0 0 40px rgba(139, 92, 246, 0.3); }
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(45deg, #8b5cf6, #a855f7);
-        color: #ffffff;
-        border: none;
-        border-radius: 8px;
-        padding: 0.5rem 1.5rem;
-        font-weight: 600;
-        font-family: 'Orbitron', monospace;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(139, 92, 246, 0.3);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(45deg, #a855f7, #8b5cf6);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(139, 92, 246, 0.5);
-    }
-    
-    /* Primary Button */
-    .stButton > button[kind="primary"] {
-        background: linear-gradient(45deg, #ec4899, #f472b6);
-        box-shadow: 0 4px 15px rgba(236, 72, 153, 0.3);
-    }
-    
-    .stButton > button[kind="primary"]:hover {
-        background: linear-gradient(45deg, #f472b6, #ec4899);
-        box-shadow: 0 6px 20px rgba(236, 72, 153, 0.5);
-    }
-    
-    /* Cards */
-    .news-card {
-        background: linear-gradient(135deg, rgba(248, 244, 255, 0.8), rgba(232, 213, 242, 0.8));
-        border: 1px solid #8b5cf6;
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 8px 32px rgba(139, 92, 246, 0.1);
-        transition: all 0.3s ease;
-        backdrop-filter: blur(10px);
-    }
-    
-    .news-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 12px 40px rgba(139, 92, 246, 0.2);
-        border-color: #8b5cf6;
-    }
-    
-    /* Sidebar */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #f8f4ff, #e8d5f2);
-        border-right: 2px solid #8b5cf6;
-    }
-    
-    /* Input Fields */
-    .stTextInput > div > div > input {
-        background: rgba(248, 244, 255, 0.8);
-        border: 1px solid #8b5cf6;
-        border-radius: 8px;
-        color: #000000;
-        padding: 0.5rem;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #8b5cf6;
-        box-shadow: 0 0 10px rgba(139, 92, 246, 0.3);
-    }
-    
-    /* Selectbox */
-    .stSelectbox > div > div {
-        background: rgba(248, 244, 255, 0.8);
-        border: 1px solid #8b5cf6;
-        border-radius: 8px;
-    }
-    
-    /* Checkbox */
-    .stCheckbox > label {
-        color: #000000;
-        font-weight: 600;
-    }
-    
-    /* Form Labels */
-    .stTextInput > label {
-        color: #000000;
-        font-weight: 600;
-    }
-    
-    /* Placeholder text */
-    .stTextInput > div > div > input::placeholder {
-        color: #6b7280;
-    }
-    
-    /* Spinner */
-    .stSpinner {
-        color: #8b5cf6;
-    }
-    
-    /* Success/Error Messages */
-    .stSuccess {
-        background: linear-gradient(135deg, rgba(139, 92, 246, 0.1), rgba(168, 85, 247, 0.1));
-        border: 1px solid #8b5cf6;
-        border-radius: 8px;
-    }
-    
-    .stError {
-        background: linear-gradient(135deg, rgba(236, 72, 153, 0.1), rgba(244, 114, 182, 0.1));
-        border: 1px solid #ec4899;
-        border-radius: 8px;
-    }
-    
-    .stWarning {
-        background: linear-gradient(135deg, rgba(251, 191, 36, 0.1), rgba(245, 158, 11, 0.1));
-        border: 1px solid #fbbf24;
-        border-radius: 8px;
-    }
-    
-    /* Images */
-    .stImage {
-        border-radius: 10px;
-        box-shadow: 0 4px 20px rgba(139, 92, 246, 0.2);
-    }
-    
-    /* Links */
-    a {
-        color: #8b5cf6;
-        text-decoration: none;
-        transition: all 0.3s ease;
-    }
-    
-    a:hover {
-        color: #a855f7;
-        text-shadow: 0 0 5px rgba(139, 92, 246, 0.3);
-    }
-    
-    /* Divider */
-    hr {
-        border: none;
-        height: 2px;
-        background: linear-gradient(90deg, transparent, #8b5cf6, transparent);
-        margin: 2rem 0;
-    }
-    
-    /* Footer */
-    .stCaption {
-        color: #6b7280;
-        text-align: center;
-        font-size: 0.9rem;
-    }
-    
-    /* Custom Scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: #f8f4ff;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: #8b5cf6;
-        border-radius: 4px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: #a855f7;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(theme_head_html(), unsafe_allow_html=True)
+    components.html(theme_loader_html(), height=0)
 
 def create_cyberpunk_header():
     """Create elegant header with purple/pink theme"""
@@ -243,23 +102,110 @@ def create_cyberpunk_header():
     </div>
     """, unsafe_allow_html=True)
 
+# Precompiled feed templates. Kept flat (no indentation or blank lines) so
+# Markdown treats each card as one HTML block; styling lives in CSS classes.
+CARD_TEMPLATE = Template(
+    '<div class="news-card">'
+    '<div class="news-card-header"><span class="news-index">#$index</span><h3 class="news-title">$title</h3></div>'
+    '$image$meta$analysis$link'
+    '</div><hr class="news-divider">'
+)
+IMAGE_TEMPLATE = Template('<img class="news-image" src="$src" alt="📸 Article Image" loading="lazy">')
+IMAGE_PLACEHOLDER = '<div class="news-image news-image-placeholder">📸</div>'
+META_TEMPLATE = Template('<div class="news-meta"><p>📅 Published: $published | 📡 Source: $source</p>$also</div>')
+ALSO_REPORTED_TEMPLATE = Template('<p class="also-reported">🔁 Also reported by: $links</p>')
+ANALYSIS_TEMPLATE = Template('$warning<div class="ai-analysis"><h4>🤖 AI ANALYSIS</h4>$body</div>')
+LINK_TEMPLATE = Template('<div class="article-link"><a href="$url" target="_blank" data-article-id="$id">🔗 ACCESS FULL ARTICLE</a></div>')
+PENDING_BODY = '<p class="ai-pending">🤖 AI is analyzing article data...</p>'
+REFINING_NOTE = '<p class="ai-pending ai-refining">🤖 Refining with AI...</p>'
+CARD_CACHE_SIZE = 512
+
+def _text(value):
+    """HTML-escaped text on one line; a blank line would end the card's HTML block in Markdown"""
+    return escape(" ".join((value or "").split()))
+
+def create_also_reported_by(sources):
+    """Build the "also reported by" line from (source, url) pairs, or an empty string"""
+    if not sources:
+        return ""
+    
+    links = ", ".join(
+        f'<a href="{escape(url)}" target="_blank">{_text(name)}</a>' if url else _text(name)
+        for name, url in sources
+    )
+    return ALSO_REPORTED_TEMPLATE.substitute(links=links)
+
+def _analysis_html(summary, warning=None, pending=False):
+    if pending:
+        # A quick local summary, when there is one, is shown until the AI summary replaces it
+        body = f"<p>{_text(summary)}</p>{REFINING_NOTE}" if summary else PENDING_BODY
+    else:
+        body = f"<p>{_text(summary)}</p>"
+    warning_html = f'<div class="ai-warning">{_text(warning)}</div>' if warning else ""
+    return ANALYSIS_TEMPLATE.substitute(warning=warning_html, body=body)
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def render_card_html(article, index, summary=None, warning=None, pending=False, image_src=None):
+    """Render one news card to HTML; unchanged cards come from the cache.
+
+    summary defaults to article.summary. image_src defaults to the
+    publisher's image URL; "" shows a placeholder instead. Articles are
+    immutable, so the cache key always matches the rendered content.
+    """
+    image = ""
+    if article.image_url:
+        src = article.image_url if image_src is None else image_src
+        image = IMAGE_TEMPLATE.substitute(src=escape(src)) if src else IMAGE_PLACEHOLDER
+    meta = ""
+    if article.published_at:
+        meta = META_TEMPLATE.substitute(
+            published=article.published_at.strftime('%Y-%m-%d %H:%M'),
+            source=_text(article.source),
+            also=create_also_reported_by(article.also_reported_by),
+        )
+    link = LINK_TEMPLATE.substitute(url=escape(article.url), id=escape(article.id)) if article.url else ""
+    return CARD_TEMPLATE.substitute(
+        index=index,
+        title=_text(article.title),
+        image=image,
+        meta=meta,
+        analysis=_analysis_html(summary if summary is not None else article.summary, warning, pending),
+        link=link,
+    )
+
+def render_feed_html(articles, start=1, image_srcs=None):
+    """Render a list of fully summarized articles as one HTML string"""
+    image_srcs = image_srcs or [None] * len(articles)
+    return "".join(
+        render_card_html(article, index, image_src=src)
+        for index, (article, src) in enumerate(zip(articles, image_srcs), start)
+    )
+
+class FeedRenderer:
+    """Emit feed HTML into Streamlit elements while counting elements, bytes and time"""
+    
+    def __init__(self):
+        self.elements = 0
+        self.bytes_sent = 0
+        self._started = time.perf_counter()
+    
+    def emit(self, html, target=None):
+        """Write html to target (an st.empty() slot) or to the page"""
+        (target or st).markdown(html, unsafe_allow_html=True)
+        self.elements += 1
+        self.bytes_sent += len(html.encode("utf-8"))
+    
+    def stats(self):
+        return {
+            "elements": self.elements,
+            "bytes": self.bytes_sent,
+            "ms": (time.perf_counter() - self._started) * 1000,
+            "card_cache": render_card_html.cache_info()._asdict(),
+        }
+
 def create_news_card(article, index):
     """Create elegant news card with purple/pink theme"""
-    st.markdown(f"""
-    <div class="news-card">
-        <div style="display: flex; align-items: center; margin-bottom: 1rem;">
-            <span style="background: linear-gradient(45deg, #8b5cf6, #a855f7); 
-                        color: #ffffff; padding: 0.3rem 0.8rem; border-radius: 20px; 
-                        font-weight: 700; font-family: 'Orbitron', monospace; 
-                        font-size: 0.9rem; margin-right: 1rem;">
-                #{index}
-            </span>
-            <h3 style="margin: 0; color: #8b5cf6; font-family: 'Orbitron', monospace;">
-                {article.get('title', 'No Title')}
-            </h3>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(render_card_html(article, index), unsafe_allow_html=True)
 
 def create_loading_animation():
     """Create elegant loading animation"""
@@ -295,3 +241,7 @@ def create_footer():
         </p>
     </div>
     """, unsafe_allow_html=True)
+
+def article_click_listener(key="article-clicks"):
+    """{"id": article id, "at": click time in ms} of the latest article link click, or None"""
+    return _article_link(key=key, default=None)
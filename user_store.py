@@ -0,0 +1,229 @@
+"""
+Cached, Write-Behind User Data Store for Tech News App
+
+Works with any Firestore-compatible client: the real firebase_admin client,
+the Firestore emulator (set FIRESTORE_EMULATOR_HOST) or InMemoryFirestore.
+"""
+import atexit
+import copy
+import threading
+import time
+
+USERS_COLLECTION = "users"
+DEFAULT_CACHE_TTL = 30.0  # Seconds a read-through document stays cached
+DEFAULT_FLUSH_INTERVAL = 2.0  # Seconds between write-behind flushes
+MAX_BATCH_WRITES = 500  # Firestore limit per batched write
+
+
+def deep_merge(base, updates):
+    """Merge updates into base the way Firestore set(..., merge=True) does"""
+    merged = dict(base)
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class UserDataStore:
+    """Process-wide client, read-through TTL cache and coalescing write-behind queue"""
+
+    def __init__(self, client_factory, collection=USERS_COLLECTION,
+                 cache_ttl=DEFAULT_CACHE_TTL, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self._client_factory = client_factory
+        self._client = None
+        self.collection = collection
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self.last_flush_error = None
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._cache = {}
+        self._pending = {}
+        # Writes handed to a batch that has not committed yet; reads overlay them too
+        self._flushing = {}
+        self._commits = 0
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def client(self):
+        """Create the Firestore client once per process"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def _document(self, uid):
+        return self.client.collection(self.collection).document(uid)
+
+    def get(self, uid):
+        """Return the user's document with queued and in-flight writes applied, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(uid)
+        if entry is not None and now - entry[1] < self.cache_ttl:
+            data = entry[0]
+            with self._lock:
+                overlays = [self._flushing.get(uid), self._pending.get(uid)]
+        else:
+            with self._lock:
+                flushing_before = self._flushing.get(uid)
+                commits = self._commits
+            snapshot = self._document(uid).get()
+            data = snapshot.to_dict() if snapshot.exists else None
+            with self._lock:
+                # A read overlapping a commit may predate it, so it is not cached
+                if flushing_before is None and uid not in self._flushing and commits == self._commits:
+                    self._cache[uid] = (data, now)
+                overlays = [flushing_before, self._flushing.get(uid), self._pending.get(uid)]
+
+        for overlay in overlays:
+            if overlay:
+                data = deep_merge(data or {}, overlay)
+        return copy.deepcopy(data)
+
+    def save(self, uid, user_data):
+        """Queue a merge write; repeated saves for a uid are coalesced into one"""
+        with self._lock:
+            self._pending[uid] = deep_merge(self._pending.get(uid, {}), user_data)
+            self._cache.pop(uid, None)
+        self._ensure_started()
+
+    def flush(self):
+        """Write every queued merge with Firestore batched writes. Returns the number of documents written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._flushing = dict(pending)
+            if not pending:
+                return 0
+
+            items = list(pending.items())
+            written = 0
+            try:
+                for start in range(0, len(items), MAX_BATCH_WRITES):
+                    chunk = items[start:start + MAX_BATCH_WRITES]
+                    batch = self.client.batch()
+                    for uid, data in chunk:
+                        batch.set(self._document(uid), data, merge=True)
+                    batch.commit()
+                    # Committed: reads now see these writes in Firestore, and cached reads may predate them
+                    with self._lock:
+                        for uid, _ in chunk:
+                            self._flushing.pop(uid, None)
+                            self._cache.pop(uid, None)
+                        self._commits += 1
+                    written += len(chunk)
+            except Exception as e:
+                self.last_flush_error = e
+                # Re-queue what was not written, under any newer saves
+                with self._lock:
+                    for uid, data in items[written:]:
+                        self._pending[uid] = deep_merge(data, self._pending.get(uid, {}))
+                    self._flushing = {}
+                raise
+            self.last_flush_error = None
+            return written
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="user-store-flush", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # Kept in last_flush_error and retried next interval
+
+    def close(self):
+        """Stop the background thread and flush what is still queued"""
+        self._stopped.set()
+        self._wakeup.set()
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+
+class _MemorySnapshot:
+    def __init__(self, data):
+        self.exists = data is not None
+        self._data = copy.deepcopy(data)
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+
+class _MemoryDocument:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+
+    def get(self):
+        with self._db._lock:
+            self._db.reads += 1
+            return _MemorySnapshot(self._db.documents.get(self.path))
+
+    def set(self, data, merge=False):
+        with self._db._lock:
+            self._db.writes += 1
+            current = self._db.documents.get(self.path)
+            self._db.documents[self.path] = deep_merge(current or {}, data) if merge else copy.deepcopy(data)
+
+
+class _MemoryCollection:
+    def __init__(self, db, name):
+        self._db = db
+        self.name = name
+
+    def document(self, doc_id):
+        return _MemoryDocument(self._db, f"{self.name}/{doc_id}")
+
+
+class _MemoryBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, document, data, merge=False):
+        self._writes.append((document, data, merge))
+
+    def commit(self):
+        self._db.batches += 1
+        for document, data, merge in self._writes:
+            document.set(data, merge=merge)
+        self._writes = []
+
+
+class InMemoryFirestore:
+    """Minimal in-memory stand-in for the Firestore client, with read/write counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = {}
+        self.reads = 0
+        self.writes = 0
+        self.batches = 0
+
+    def collection(self, name):
+        return _MemoryCollection(self, name)
+
+    def batch(self):
+        return _MemoryBatch(self)